@@ -1,21 +1,31 @@
 import os
-import json
+import heapq
 import logging
-from datetime import datetime
+from datetime import date, datetime, timedelta
 import tkinter as tk
-from tkinter import ttk, messagebox
-from tkinter.scrolledtext import ScrolledText
+from tkinter import ttk
 from todo.models import Task
 from todo import storage
-from todo.utils import format_duration
+from todo.history import History, HISTORY_SUFFIX, add_entry, delete_entry, update_entry
+from todo.metrics import metrics, timed, timer
+from todo.repository import TaskRepository
+from todo.search import SearchIndex
+from todo.timers import TimerScheduler
+from todo.tracking import record_session, summarize
+from todo.watcher import StoreWatcher
+from todo.utils import due_bucket, format_duration, normalize_due_date
 
 # ---------- Configuration ----------
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# a .db/.sqlite path selects the SQLite backend (todo/sqlite_storage.py)
 TASKS_PATH = os.path.join(BASE_DIR, "tasks.json")
 LOG_PATH = os.path.join(BASE_DIR, "todo.log")
+# written only when instrumentation is enabled (TODO_METRICS=1) / profiling is toggled (F12)
+METRICS_PATH = os.path.join(BASE_DIR, "todo_metrics.json")
+PROFILE_PATH = os.path.join(BASE_DIR, "todo_profile.prof")
+METRICS_DUMP_MS = 10000
 
-logging.basicConfig(filename=LOG_PATH, level=logging.INFO,
-                    format="%(asctime)s %(levelname)s %(message)s")
+store = storage.get_backend(TASKS_PATH)
 
 PRIORITY_COLORS = {
     "high": "#e53935",    # red
@@ -24,6 +34,274 @@ PRIORITY_COLORS = {
     "done": "#212121",    # black/near-black
 }
 
+CARD_HEIGHT = 104                # fixed card height so rows can be virtualized
+ROW_HEIGHT = CARD_HEIGHT + 12    # card plus vertical gap
+SEARCH_DEBOUNCE_MS = 200         # quiet period before the search box re-filters
+PERSIST_WINDOW_S = 0.5           # background writer coalescing window
+LOAD_BATCH_SIZE = 500            # tasks read per idle callback at startup
+WATCH_INTERVAL_MS = 1000         # how often the store is checked for external edits
+ARCHIVE_AFTER_DAYS = 30          # done tasks older than this are archived on close
+REMINDER_MAX_WAIT_MS = 3600000   # re-arm the reminder timer at least hourly (sleep/clock changes)
+# due filter menu label -> DueIndex bucket
+DUE_FILTERS = {"any due": "all", "overdue": "overdue", "due today": "today",
+               "this week": "week", "later": "later"}
+SORT_MODES = ("Newest", "Oldest", "Due date")
+# time report period label -> days back from today (None: everything tracked)
+REPORT_PERIODS = {"Today": 1, "Last 7 days": 7, "Last 30 days": 30, "All time": None}
+REPORT_TOP_TASKS = 20
+
+# ---------- Task card ----------
+class TaskCard:
+    """A reusable task card that is rebound to different tasks while scrolling."""
+
+    def __init__(self, app, canvas, width):
+        self.app = app
+        self.canvas = canvas
+        self.task = None
+        self.row = None
+
+        self.frame = ttk.Frame(canvas, style="Card.TFrame", padding=10, relief="flat")
+        self.frame.columnconfigure(1, weight=1)
+
+        # priority badge
+        self.badge = tk.Label(self.frame, fg="white", padx=8, pady=4, font=("Segoe UI", 9, "bold"))
+        self.badge.grid(row=0, column=0, rowspan=2, sticky="nsw", padx=(0,10))
+
+        # title, desc and meta
+        self.title_lbl = ttk.Label(self.frame, font=("Segoe UI", 11, "bold"))
+        self.title_lbl.grid(row=0, column=1, sticky="w")
+        self.desc_lbl = ttk.Label(self.frame, style="Muted.TLabel")
+        self.desc_lbl.grid(row=1, column=1, sticky="w")
+        self.meta_lbl = ttk.Label(self.frame, style="Muted.TLabel")
+        self.meta_lbl.grid(row=2, column=1, sticky="w", pady=(6,0))
+
+        # right-side buttons
+        btn_frame = ttk.Frame(self.frame)
+        btn_frame.grid(row=0, column=2, rowspan=3, sticky="e")
+        edit_btn = ttk.Button(btn_frame, text="Edit", command=lambda: self.app._open_edit_window(self.task))
+        edit_btn.grid(row=0, column=0, padx=4, pady=2)
+        self.done_btn = ttk.Button(btn_frame, command=self._on_done_clicked)
+        self.done_btn.grid(row=0, column=1, padx=4, pady=2)
+        del_btn = ttk.Button(btn_frame, text="Delete", command=lambda: self.app._delete_task(self.task))
+        del_btn.grid(row=0, column=2, padx=4, pady=2)
+
+        # timer label only - no controls needed since timer starts automatically
+        timer_frame = ttk.Frame(btn_frame)
+        timer_frame.grid(row=1, column=0, columnspan=3, pady=(6,0))
+        self.timer_lbl = ttk.Label(timer_frame)
+        self.timer_lbl.grid(row=0, column=0, padx=(0,6))
+
+        self.item = canvas.create_window(0, 0, window=self.frame, anchor="nw",
+                                         width=max(width, 1), height=CARD_HEIGHT, state="hidden")
+
+    def _on_done_clicked(self):
+        if self.task.status == "done":
+            self.app._undo_done(self.task)
+        else:
+            self.app._mark_done(self.task)
+
+    def show(self, row: int, task: Task):
+        if self.task is not None and self.app.timer_labels.get(self.task.id) is self.timer_lbl:
+            del self.app.timer_labels[self.task.id]
+        self.task = task
+        self.row = row
+
+        done = task.status == "done"
+        color_key = "done" if done else task.priority
+        self.badge.config(text="DONE" if done else task.priority.upper(),
+                          bg=PRIORITY_COLORS.get(color_key, "#999999"))
+        self.title_lbl.config(text=("✓ " + task.title) if done else task.title)
+        self.desc_lbl.config(text=task.description if task.description else "(no description)")
+        meta = f"Created: {task.created_at.split('T')[0]}"
+        if task.due_date:
+            meta += f"  •  Due: {task.due_date}"
+            due = self.app.repo.due.due_of(task.id)
+            if due is not None and due < date.today():
+                meta += " (overdue)"
+        self.meta_lbl.config(text=meta)
+        self.done_btn.config(text="Undo" if done else "Mark Done")
+
+        # elapsed time label
+        elapsed = self.app.timers.elapsed(task.id, task.remaining_seconds)
+        self.timer_lbl.config(text=f"Time: {format_duration(elapsed)}")
+        self.app.timer_labels[task.id] = self.timer_lbl
+
+        self.canvas.coords(self.item, 0, row * ROW_HEIGHT)
+        self.canvas.itemconfigure(self.item, state="normal")
+
+    def hide(self):
+        if self.task is not None and self.app.timer_labels.get(self.task.id) is self.timer_lbl:
+            del self.app.timer_labels[self.task.id]
+        self.task = None
+        self.row = None
+        self.canvas.itemconfigure(self.item, state="hidden")
+
+# ---------- Task dialog ----------
+class TaskDialog:
+    """The modal add/edit window; built once, withdrawn when closed and re-shown."""
+
+    def __init__(self, app):
+        # only needed once a dialog opens, so kept out of startup
+        from tkinter.scrolledtext import ScrolledText
+        self.app = app
+        self.task = None
+
+        win = self.win = tk.Toplevel(app.root)
+        win.withdraw()
+        win.transient(app.root)
+        win.geometry("480x460")
+        win.minsize(420,420)
+        win.configure(bg="#f7f8fa")
+        win.protocol("WM_DELETE_WINDOW", self.close)
+        win.bind("<Escape>", lambda _e: self.close())
+
+        header = ttk.Frame(win, padding=12)
+        header.pack(fill="x")
+        self.header_lbl = ttk.Label(header, font=("Segoe UI", 12, "bold"))
+        self.header_lbl.pack(side="left")
+
+        body = ttk.Frame(win, padding=12)
+        body.pack(fill="both", expand=True)
+
+        # Title
+        ttk.Label(body, text="Title", font=("Segoe UI", 10, "bold")).pack(anchor="w", pady=(6,0))
+        self.title_var = tk.StringVar()
+        self.title_entry = ttk.Entry(body, textvariable=self.title_var)
+        self.title_entry.pack(fill="x", pady=(0,6))
+
+        # Description
+        ttk.Label(body, text="Description", font=("Segoe UI", 10, "bold")).pack(anchor="w", pady=(6,0))
+        self.desc_text = ScrolledText(body, height=6)
+        self.desc_text.pack(fill="both", pady=(0,6))
+
+        # Priority & Due
+        form_row = ttk.Frame(body)
+        form_row.pack(fill="x", pady=(6,0))
+
+        ttk.Label(form_row, text="Priority", font=("Segoe UI", 10, "bold")).grid(row=0, column=0, sticky="w")
+        self.prio_var = tk.StringVar(value="medium")
+        prio_menu = ttk.OptionMenu(form_row, self.prio_var, "medium", "high", "medium", "low")
+        prio_menu.grid(row=1, column=0, padx=(0,12), sticky="w")
+
+        ttk.Label(form_row, text="Due (YYYY-MM-DD)", font=("Segoe UI", 10, "bold")).grid(row=0, column=1, sticky="w")
+        self.due_var = tk.StringVar()
+        due_entry = ttk.Entry(form_row, textvariable=self.due_var)
+        due_entry.grid(row=1, column=1, padx=(6,12), sticky="w")
+
+        # action buttons
+        btn_frame = ttk.Frame(body)
+        btn_frame.pack(fill="x", pady=(18,0))
+        save_btn = ttk.Button(btn_frame, text="Save", style="Accent.TButton", command=self._on_save)
+        save_btn.pack(side="right", padx=(6,0))
+        cancel_btn = ttk.Button(btn_frame, text="Cancel", command=self.close)
+        cancel_btn.pack(side="right")
+
+    def open(self, task: Task = None):
+        self.task = task
+        self.win.title("Add Task" if task is None else "Edit Task")
+        self.header_lbl.config(text="Add a new task" if task is None else "Edit task")
+        self.title_var.set(task.title if task else "")
+        self.desc_text.delete("1.0", "end")
+        if task and task.description:
+            self.desc_text.insert("1.0", task.description)
+        self.prio_var.set(task.priority if task else "medium")
+        self.due_var.set(task.due_date if task and task.due_date else "")
+        self.win.deiconify()
+        self.win.lift()
+        self.win.grab_set()
+        self.title_entry.focus_set()
+
+    def close(self):
+        self.task = None
+        self.win.grab_release()
+        self.win.withdraw()
+
+    def _on_save(self):
+        from tkinter import messagebox
+        title_text = self.title_var.get().strip()
+        if not title_text:
+            messagebox.showwarning("Validation error", "Title is required.", parent=self.win)
+            return
+        description = self.desc_text.get("1.0", "end").strip()
+        try:
+            due = normalize_due_date(self.due_var.get())
+        except ValueError:
+            messagebox.showwarning("Validation error", "Due date must be a date like 2025-09-25.",
+                                   parent=self.win)
+            return
+        task = self.task
+        self.close()
+        self.app._save_task(task, title_text, description, self.prio_var.get(), due)
+
+# ---------- Time report ----------
+class ReportWindow:
+    """Tracked time per day, week, priority and task; built once and re-shown."""
+
+    def __init__(self, app):
+        self.app = app
+        win = self.win = tk.Toplevel(app.root)
+        win.withdraw()
+        win.transient(app.root)
+        win.title("Time report")
+        win.geometry("520x560")
+        win.configure(bg="#f7f8fa")
+        win.protocol("WM_DELETE_WINDOW", win.withdraw)
+        win.bind("<Escape>", lambda _e: win.withdraw())
+
+        header = ttk.Frame(win, padding=12)
+        header.pack(fill="x")
+        ttk.Label(header, text="Time tracked", font=("Segoe UI", 12, "bold")).pack(side="left")
+        refresh_btn = ttk.Button(header, text="Refresh", command=self.refresh)
+        refresh_btn.pack(side="right", padx=(6,0))
+        self.period = tk.StringVar(value="Last 7 days")
+        period_menu = ttk.OptionMenu(header, self.period, "Last 7 days", *REPORT_PERIODS,
+                                     command=lambda _e: self.refresh())
+        period_menu.pack(side="right")
+
+        self.text = tk.Text(win, wrap="none", font=("Consolas", 10), padx=12, pady=8, relief="flat")
+        self.text.pack(fill="both", expand=True, padx=12, pady=(0,12))
+
+    def open(self):
+        self.refresh()
+        self.win.deiconify()
+        self.win.lift()
+
+    def refresh(self):
+        self.text.config(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", "\n".join(self._lines()))
+        self.text.config(state="disabled")
+
+    @timed("ui.time_report")
+    def _lines(self):
+        app = self.app
+        days = REPORT_PERIODS[self.period.get()]
+        start = None
+        if days is not None:
+            start = datetime.combine(date.today() - timedelta(days=days - 1), datetime.min.time())
+        # tasks are archived by creation date, so archived ones can hold recent sessions
+        app._load_archive()
+        tasks = list(app.repo) + list(app.archive_repo)
+        running = {tid: app.timers.running_for(tid) for tid in app.timers.running_ids()}
+        report = summarize(tasks, start=start, running=running)
+
+        lines = [f"Total (any timer running): {format_duration(report['total'])}", "", "By day"]
+        lines += [f"  {day:%a %Y-%m-%d}   {format_duration(s):>10}" for day, s in report["by_day"].items()]
+        lines += ["", "By week"]
+        lines += [f"  week of {monday:%Y-%m-%d}   {format_duration(s):>10}"
+                  for monday, s in report["by_week"].items()]
+        lines += ["", "By priority"]
+        lines += [f"  {p:<8} {format_duration(report['by_priority'][p]):>10}"
+                  for p in ("high", "medium", "low") if p in report["by_priority"]]
+        lines += ["", "Tasks"]
+        for task_id, seconds in list(report["by_task"].items())[:REPORT_TOP_TASKS]:
+            task = app.repo.get(task_id) or app.archive_repo.get(task_id)
+            title = task.title if task else f"task {task_id}"
+            lines.append(f"  #{task_id:<6} {title[:32]:<32} {format_duration(seconds):>10}")
+        if not report["by_task"]:
+            lines.append("  nothing tracked in this period")
+        return lines
+
 # ---------- App ----------
 class TodoApp:
     def __init__(self, root):
@@ -37,13 +315,69 @@ class TodoApp:
         self._setup_style()
 
         # data
-        self.tasks = storage.load_tasks(TASKS_PATH)
-        self.timers = {}  # task_id -> after_id
-        self.timer_labels = {}  # task_id -> label widget to update
+        # tasks are streamed in batches (see _load_next_batch) so the window
+        # shows up before a large store has been read
+        self.repo = TaskRepository()
+        self.search_index = SearchIndex()
+        # other processes may share the store; sync tracks what we have seen
+        self.sync = store.StoreSync(TASKS_PATH)
+        self.sync.mark()
+        self._loader = store.iter_task_batches(TASKS_PATH, LOAD_BATCH_SIZE)
+        self.loading = True
+        # changes are coalesced and written off the Tk thread
+        self.writer = storage.BackgroundWriter(TASKS_PATH, store, window=PERSIST_WINDOW_S,
+                                               sync=self.sync)
+        self.watcher = StoreWatcher(TASKS_PATH, store, self.sync)
+        # undo/redo of user actions, persisted next to the journal
+        self.history = History(TASKS_PATH + HISTORY_SUFFIX)
+        # archived (old, done) tasks are read only when a view asks for them
+        self.archive_repo = None
+        self.archive_search = None
+        self.task_dialog = None  # built on first Add/Edit (see TaskDialog)
+        self.report_window = None  # built when the time report is first opened
+        self.timers = TimerScheduler()  # running timers, ticked by one shared loop
+        self.timer_labels = {}  # task_id -> label widget to update (visible cards only)
 
         # UI layout
         self._build_ui()
-        self._render_tasks()
+        # the empty shell is mapped first; tasks are read and rendered from idle callbacks
+        self.root.after_idle(self._load_next_batch)
+        self._schedule_tick()
+        if metrics.enabled:
+            self.root.after(METRICS_DUMP_MS, self._dump_metrics)
+
+    def _dump_metrics(self):
+        metrics.dump(METRICS_PATH)
+        self.root.after(METRICS_DUMP_MS, self._dump_metrics)
+
+    def _toggle_profile(self, _event=None):
+        active = metrics.toggle_profile(PROFILE_PATH)
+        logging.info("Profiling started" if active else f"Profile written to {PROFILE_PATH}")
+
+    @timed("ui.load_batch")
+    def _load_next_batch(self):
+        batch = next(self._loader, None)
+        if batch is None:
+            self.loading = False
+            self.add_button.state(["!disabled"])
+            if len(self.timers):
+                logging.info(f"Started timers for {len(self.timers)} pending tasks")
+            self._render_tasks()
+            self.root.after(WATCH_INTERVAL_MS, self._watch_store)
+            self._schedule_reminder()
+            return
+        first = len(self.repo) == 0
+        self.repo.add_many(batch)
+        for task in batch:
+            self.search_index.add(task)
+            # every pending task's timer runs automatically
+            if task.status != "done":
+                self.timers.start(task.id, task.remaining_seconds)
+        if first:
+            self._render_tasks()
+        else:
+            self._update_stats()
+        self.root.after_idle(self._load_next_batch)
 
     def _setup_style(self):
         # Use a clean theme if available
@@ -72,22 +406,34 @@ class TodoApp:
         self.search_var = tk.StringVar()
         search_entry = ttk.Entry(top, textvariable=self.search_var)
         search_entry.grid(row=0, column=1, sticky="ew", padx=8)
-        self.search_var.trace_add("write", lambda *args: self._render_tasks())
+        self._search_after = None
+        self.search_var.trace_add("write", lambda *args: self._on_search_changed())
 
         # filter controls
         self.status_filter = tk.StringVar(value="all")
         status_menu = ttk.OptionMenu(top, self.status_filter, "all", "all", "pending", "done", command=lambda _e: self._render_tasks())
+        # the "done" filter always includes archived tasks; this adds them to any view
+        self.include_archive = tk.BooleanVar(value=False)
+        archive_check = ttk.Checkbutton(top, text="Archive", variable=self.include_archive,
+                                        command=self._render_tasks)
         status_menu.grid(row=0, column=2, padx=6)
+        archive_check.grid(row=0, column=3, padx=6)
 
         self.priority_filter = tk.StringVar(value="all")
         priority_menu = ttk.OptionMenu(top, self.priority_filter, "all", "all", "high", "medium", "low", command=lambda _e: self._render_tasks())
-        priority_menu.grid(row=0, column=3, padx=6)
+        priority_menu.grid(row=0, column=4, padx=6)
+
+        self.due_filter = tk.StringVar(value="any due")
+        due_menu = ttk.OptionMenu(top, self.due_filter, "any due", *DUE_FILTERS, command=lambda _e: self._render_tasks())
+        due_menu.grid(row=0, column=5, padx=6)
 
         sort_btn = ttk.Button(top, text="Sort: Newest", command=lambda: self._toggle_sort(sort_btn))
-        sort_btn.grid(row=0, column=4, padx=6)
+        sort_btn.grid(row=0, column=6, padx=6)
 
-        add_button = ttk.Button(top, text="Add Task", style="Accent.TButton", command=self._open_add_window)
-        add_button.grid(row=0, column=5, padx=(12,0))
+        # disabled until loading finishes so new ids can't collide with unread tasks
+        self.add_button = ttk.Button(top, text="Add Task", style="Accent.TButton", command=self._open_add_window)
+        self.add_button.grid(row=0, column=7, padx=(12,0))
+        self.add_button.state(["disabled"])
 
         # main frames
         left = ttk.Frame(self.root, padding=(12,6))
@@ -109,17 +455,37 @@ class TodoApp:
         self.stats_label.grid(row=1, column=0, sticky="w", pady=(6,0))
         self._update_stats()
 
-        # right: tasks list (scrollable)
-        self.task_canvas = tk.Canvas(right, borderwidth=0, highlightthickness=0, bg="#f4f6f8")
+        reminder_card = ttk.Frame(left, style="Card.TFrame", padding=12)
+        reminder_card.grid(row=1, column=0, sticky="nwe", pady=(12,0))
+        ttk.Label(reminder_card, text="Reminders", font=("Segoe UI", 12, "bold")).grid(row=0, column=0, sticky="w")
+        self.reminder_label = ttk.Label(reminder_card, text="No reminders yet", style="Muted.TLabel",
+                                        wraplength=260, justify="left")
+        self.reminder_label.grid(row=1, column=0, sticky="w", pady=(6,0))
+        self._reminder_after = None
+
+        tracking_card = ttk.Frame(left, style="Card.TFrame", padding=12)
+        tracking_card.grid(row=2, column=0, sticky="nwe", pady=(12,0))
+        ttk.Label(tracking_card, text="Time tracking", font=("Segoe UI", 12, "bold")).grid(row=0, column=0, sticky="w")
+        report_btn = ttk.Button(tracking_card, text="Time report…", command=self._open_report)
+        report_btn.grid(row=1, column=0, sticky="w", pady=(6,0))
+
+        # right: tasks list (virtualized: a fixed pool of cards is rebound
+        # to whichever rows are currently inside the viewport)
+        self.task_canvas = tk.Canvas(right, borderwidth=0, highlightthickness=0, bg="#f4f6f8",
+                                     yscrollincrement=ROW_HEIGHT // 4)
         self.task_scroll = ttk.Scrollbar(right, orient="vertical", command=self.task_canvas.yview)
-        self.task_frame = ttk.Frame(self.task_canvas)
-
-        self.task_frame.bind(
-            "<Configure>",
-            lambda e: self.task_canvas.configure(scrollregion=self.task_canvas.bbox("all"))
-        )
-        self.task_canvas.create_window((0,0), window=self.task_frame, anchor="nw")
-        self.task_canvas.configure(yscrollcommand=self.task_scroll.set)
+        self.task_canvas.configure(yscrollcommand=self._on_canvas_scroll)
+        self.task_canvas.bind("<Configure>", self._on_canvas_configure)
+        self.root.bind_all("<MouseWheel>", self._on_mousewheel)
+        self.root.bind_all("<Button-4>", self._on_mousewheel)
+        self.root.bind_all("<Button-5>", self._on_mousewheel)
+        self.root.bind_all("<F12>", self._toggle_profile)
+        # bound on the main window only, so dialogs keep their own keys
+        self.root.bind("<Control-z>", self._undo)
+        self.root.bind("<Control-y>", self._redo)
+        self.card_pool = []      # reusable TaskCard widgets
+        self.visible_tasks = []  # filtered + sorted tasks backing the list
+        self.visible_ids = set()
 
         self.task_canvas.grid(row=0, column=0, sticky="nswe")
         self.task_scroll.grid(row=0, column=1, sticky="ns")
@@ -129,103 +495,181 @@ class TodoApp:
 
         # internal state
         self.sort_newest = True
+        self.sort_by_due = False
 
     def _toggle_sort(self, btn):
-        self.sort_newest = not self.sort_newest
-        btn.config(text=("Sort: Newest" if self.sort_newest else "Sort: Oldest"))
+        # Newest -> Oldest -> Due date -> Newest
+        mode = SORT_MODES[(SORT_MODES.index(self._sort_mode()) + 1) % len(SORT_MODES)]
+        self.sort_by_due = mode == "Due date"
+        self.sort_newest = mode != "Oldest"
+        btn.config(text=f"Sort: {mode}")
         self._render_tasks()
 
+    def _sort_mode(self) -> str:
+        if self.sort_by_due:
+            return "Due date"
+        return "Newest" if self.sort_newest else "Oldest"
+
     def _update_stats(self):
-        total = len(self.tasks)
-        pending = sum(1 for t in self.tasks if t.status != "done")
-        done = total - pending
-        high = sum(1 for t in self.tasks if t.priority == "high" and t.status != "done")
-        txt = f"Total: {total}   Pending: {pending}   Done: {done}   High priority: {high}"
+        # counters are maintained by the repository on every mutation, so
+        # this is O(1) however many tasks there are
+        stats = self.repo.stats
+        stats.set_today(date.today())
+        total = len(self.repo)
+        done = stats.by_status["done"]
+        pending = total - done
+        prio = stats.pending_by_priority
+        due = stats.by_due
+        lines = [
+            f"Total: {total}   Pending: {pending}   Done: {done}",
+            f"Pending by priority: high {prio['high']} · medium {prio['medium']} · low {prio['low']}",
+            f"Due: overdue {stats.overdue} · today {due['today']} · this week {due['week']}"
+            f" · later {due['later']} · no date {due['none']}",
+        ]
+        for p in ("high", "medium", "low"):
+            lines.append(f"Tracked ({p}): {format_duration(stats.tracked[p])}"
+                         f"   avg {format_duration(stats.average_tracked(p))}")
+        txt = "\n".join(lines)
+        if self.loading:
+            txt += "\n(loading…)"
         self.stats_label.config(text=txt)
 
-    def _render_tasks(self):
-        # clear previous cards
-        for child in self.task_frame.winfo_children():
-            child.destroy()
+    def _on_search_changed(self):
+        # debounce: only search once typing pauses for SEARCH_DEBOUNCE_MS
+        if self._search_after is not None:
+            self.root.after_cancel(self._search_after)
+        self._search_after = self.root.after(SEARCH_DEBOUNCE_MS, self._run_search)
+
+    def _run_search(self):
+        self._search_after = None
+        self._render_tasks()
 
+    def _matches_filters(self, task: Task) -> bool:
+        q = self.search_var.get().strip().lower()
+        status_f = self.status_filter.get()
+        prio_f = self.priority_filter.get()
+        if status_f != "all" and task.status != status_f:
+            return False
+        if prio_f != "all" and task.priority != prio_f:
+            return False
+        due_f = DUE_FILTERS[self.due_filter.get()]
+        if due_f != "all" and due_bucket(self.repo.due.due_of(task.id), date.today()) != due_f:
+            return False
+        if q and q not in task.title.lower() and q not in task.description.lower():
+            return False
+        return True
+
+    @timed("ui.render")
+    def _render_tasks(self):
         # prepare filtered+searched list
         q = self.search_var.get().strip().lower()
         status_f = self.status_filter.get()
         prio_f = self.priority_filter.get()
 
-        tasks = list(self.tasks)
-        if status_f != "all":
-            tasks = [t for t in tasks if t.status == status_f]
-        if prio_f != "all":
-            tasks = [t for t in tasks if t.priority == prio_f]
-        if q:
-            tasks = [t for t in tasks if q in t.title.lower() or q in t.description.lower()]
-
-        tasks.sort(key=lambda t: t.created_at, reverse=self.sort_newest)
-
-        for i, task in enumerate(tasks):
-            self._create_task_card(task, i)
+        # filtering and ordering come from the repository and search indexes
+        with timer("ui.filter_sort"):
+            ids = self.search_index.search(q) if q else None
+            due_f = DUE_FILTERS[self.due_filter.get()]
+            tasks = self.repo.query(status_f, prio_f, newest=self.sort_newest, ids=ids,
+                                    due=due_f, by_due=self.sort_by_due)
+            # archived tasks are done, so they never match a due filter
+            if due_f == "all" and (status_f == "done" or self.include_archive.get()):
+                self._load_archive()
+                archive_ids = self.archive_search.search(q) if q else None
+                archived = self.archive_repo.query(status_f, prio_f, newest=self.sort_newest,
+                                                   ids=archive_ids)
+                if archived and self.sort_by_due:
+                    tasks = tasks + archived  # no due dates: they sort last
+                elif archived:
+                    # both lists are already in created_at order
+                    tasks = list(heapq.merge(tasks, archived, key=lambda t: (t.created_at or "", t.id),
+                                             reverse=self.sort_newest))
+
+        self.visible_tasks = tasks
+        self.visible_ids = {t.id for t in tasks}
+        total_height = len(tasks) * ROW_HEIGHT
+        self.task_canvas.configure(scrollregion=(0, 0, 0, total_height))
+        if self.task_canvas.canvasy(0) >= total_height:
+            self.task_canvas.yview_moveto(0)
+        # rows may now hold different tasks; force every card to rebind
+        for card in self.card_pool:
+            card.row = None
+        self._layout_cards()
 
         self._update_stats()
 
-    def _create_task_card(self, task: Task, index: int):
-        card = ttk.Frame(self.task_frame, style="Card.TFrame", padding=10, relief="flat")
-        card.grid(row=index, column=0, sticky="ew", padx=(0,0), pady=(6,6))
-        card.columnconfigure(1, weight=1)
-
-        # priority badge
-        color_key = "done" if task.status == "done" else task.priority
-        badge_color = PRIORITY_COLORS.get(color_key, "#999999")
-        badge = tk.Label(card, text=task.priority.upper() if task.status!="done" else "DONE", bg=badge_color, fg="white", padx=8, pady=4, font=("Segoe UI", 9, "bold"))
-        badge.grid(row=0, column=0, rowspan=2, sticky="nsw", padx=(0,10))
-
-        # title
-        title_txt = task.title
-        if task.status == "done":
-            title_txt = "✓ " + title_txt
-        title_lbl = ttk.Label(card, text=title_txt, font=("Segoe UI", 11, "bold"))
-        title_lbl.grid(row=0, column=1, sticky="w")
-
-        # desc and meta
-        desc_txt = task.description if task.description else "(no description)"
-        desc_lbl = ttk.Label(card, text=desc_txt, style="Muted.TLabel")
-        desc_lbl.grid(row=1, column=1, sticky="w")
-
-        meta = f"Created: {task.created_at.split('T')[0]}"
-        if task.due_date:
-            meta += f"  •  Due: {task.due_date}"
-        meta_lbl = ttk.Label(card, text=meta, style="Muted.TLabel")
-        meta_lbl.grid(row=2, column=1, sticky="w", pady=(6,0))
-
-        # right-side buttons
-        btn_frame = ttk.Frame(card)
-        btn_frame.grid(row=0, column=2, rowspan=3, sticky="e")
-
-        edit_btn = ttk.Button(btn_frame, text="Edit", command=lambda t=task: self._open_edit_window(t))
-        edit_btn.grid(row=0, column=0, padx=4, pady=2)
+    def _load_archive(self):
+        if self.archive_repo is not None:
+            return
+        # tasks edited since they were archived live in the hot store again
+        archived = storage.load_archived_tasks(TASKS_PATH, exclude=(t.id for t in self.repo))
+        self.archive_repo = TaskRepository(archived)
+        self.archive_search = SearchIndex(archived)
+        logging.info(f"Loaded {len(archived)} archived tasks")
+
+    def _unarchive(self, task_id: int) -> bool:
+        # an archived task that is edited goes back to the hot store
+        if self.archive_repo is not None and task_id in self.archive_repo:
+            self.archive_repo.remove(task_id)
+            self.archive_search.remove(task_id)
+            return True
+        return False
+
+    def _refresh_task(self, task: Task):
+        # a single task changed: rebind its card in place when it keeps its
+        # slot in the list, otherwise fall back to a full re-filter
+        if not self._matches_filters(task) or task.id not in self.visible_ids:
+            self._render_tasks()
+            return
+        for card in self.card_pool:
+            if card.task is task and card.row is not None:
+                card.show(card.row, task)
+        self._update_stats()
 
-        if task.status != "done":
-            done_btn = ttk.Button(btn_frame, text="Mark Done", command=lambda t=task: self._mark_done(t))
+    @timed("ui.layout_cards")
+    def _layout_cards(self):
+        canvas = self.task_canvas
+        height = max(canvas.winfo_height(), ROW_HEIGHT)
+        first = max(int(canvas.canvasy(0) // ROW_HEIGHT), 0)
+        needed = height // ROW_HEIGHT + 2
+        if len(self.card_pool) < needed:
+            width = canvas.winfo_width()
+            while len(self.card_pool) < needed:
+                self.card_pool.append(TaskCard(self, canvas, width))
+            for card in self.card_pool:
+                card.row = None
+        pool = self.card_pool
+        last = min(first + len(pool), len(self.visible_tasks))
+        # row r always lives in pool[r % len(pool)], so scrolling by one row
+        # rebinds exactly one card
+        for row in range(first, last):
+            card = pool[row % len(pool)]
+            task = self.visible_tasks[row]
+            if card.row != row or card.task is not task:
+                card.show(row, task)
+        for card in pool:
+            if card.row is not None and not (first <= card.row < last):
+                card.hide()
+
+    def _on_canvas_scroll(self, first, last):
+        self.task_scroll.set(first, last)
+        self._layout_cards()
+
+    def _on_canvas_configure(self, event):
+        for card in self.card_pool:
+            self.task_canvas.itemconfigure(card.item, width=event.width)
+        self._layout_cards()
+
+    def _on_mousewheel(self, event):
+        if not str(event.widget).startswith(str(self.task_canvas)):
+            return
+        if event.num == 4:
+            step = -1
+        elif event.num == 5:
+            step = 1
         else:
-            done_btn = ttk.Button(btn_frame, text="Undo", command=lambda t=task: self._undo_done(t))
-        done_btn.grid(row=0, column=1, padx=4, pady=2)
-
-        del_btn = ttk.Button(btn_frame, text="Delete", command=lambda t=task: self._delete_task(t))
-        del_btn.grid(row=0, column=2, padx=4, pady=2)
-
-        # timer label only - no controls needed since timer starts automatically
-        timer_frame = ttk.Frame(btn_frame)
-        timer_frame.grid(row=1, column=0, columnspan=3, pady=(6,0))
-
-        # elapsed time label
-        elapsed = task.remaining_seconds if task.remaining_seconds is not None else 0
-        elapsed_lbl = ttk.Label(timer_frame, text=f"Time: {format_duration(elapsed)}")
-        elapsed_lbl.grid(row=0, column=0, padx=(0,6))
-        self.timer_labels[task.id] = elapsed_lbl
-
-        # Start timer automatically if not running and task is not done
-        if task.id not in self.timers and task.status != "done":
-            self._start_timer(task)
+            step = -1 if event.delta > 0 else 1
+        self.task_canvas.yview_scroll(step, "units")
 
     # ---------- CRUD actions ----------
     def _open_add_window(self):
@@ -235,186 +679,310 @@ class TodoApp:
         self._open_task_window(task)
 
     def _open_task_window(self, task: Task = None):
-        # modal window for add/edit task
-        win = tk.Toplevel(self.root)
-        win.transient(self.root)
-        win.grab_set()
-        win.title("Add Task" if task is None else "Edit Task")
-        win.geometry("480x460")
-        win.minsize(420,420)
-        win.configure(bg="#f7f8fa")
-
-        header = ttk.Frame(win, padding=12)
-        header.pack(fill="x")
-        title = ttk.Label(header, text=("Add a new task" if task is None else "Edit task"), font=("Segoe UI", 12, "bold"))
-        title.pack(side="left")
-
-        body = ttk.Frame(win, padding=12)
-        body.pack(fill="both", expand=True)
-
-        # Title
-        ttk.Label(body, text="Title", font=("Segoe UI", 10, "bold")).pack(anchor="w", pady=(6,0))
-        title_var = tk.StringVar(value=task.title if task else "")
-        title_entry = ttk.Entry(body, textvariable=title_var)
-        title_entry.pack(fill="x", pady=(0,6))
-
-        # Description
-        ttk.Label(body, text="Description", font=("Segoe UI", 10, "bold")).pack(anchor="w", pady=(6,0))
-        desc_text = ScrolledText(body, height=6)
-        desc_text.pack(fill="both", pady=(0,6))
-        if task and task.description:
-            desc_text.insert("1.0", task.description)
-
-        # Priority & Due & Duration
-        form_row = ttk.Frame(body)
-        form_row.pack(fill="x", pady=(6,0))
-
-        ttk.Label(form_row, text="Priority", font=("Segoe UI", 10, "bold")).grid(row=0, column=0, sticky="w")
-        prio_var = tk.StringVar(value=task.priority if task else "medium")
-        prio_menu = ttk.OptionMenu(form_row, prio_var, prio_var.get(), "high", "medium", "low")
-        prio_menu.grid(row=1, column=0, padx=(0,12), sticky="w")
-
-        ttk.Label(form_row, text="Due (YYYY-MM-DD)", font=("Segoe UI", 10, "bold")).grid(row=0, column=1, sticky="w")
-        due_var = tk.StringVar(value=task.due_date if task and task.due_date else "")
-        due_entry = ttk.Entry(form_row, textvariable=due_var)
-        due_entry.grid(row=1, column=1, padx=(6,12), sticky="w")
-
-        # action buttons
-        btn_frame = ttk.Frame(body)
-        btn_frame.pack(fill="x", pady=(18,0))
-        save_btn = ttk.Button(btn_frame, text="Save", style="Accent.TButton")
-        save_btn.pack(side="right", padx=(6,0))
-        cancel_btn = ttk.Button(btn_frame, text="Cancel", command=win.destroy)
-        cancel_btn.pack(side="right")
-
-        def on_save():
-            title_text = title_var.get().strip()
-            if not title_text:
-                messagebox.showwarning("Validation error", "Title is required.")
-                return
-            description = desc_text.get("1.0", "end").strip()
-            prio = prio_var.get()
-            due = due_var.get().strip() or None
-
-            if task is None:
-                # add new
-                new_id = storage.get_next_id(self.tasks)
-                start_time = datetime.now()
-                new_task = Task(
-                    id=new_id,
-                    title=title_text,
-                    description=description,
-                    status="pending",
-                    priority=prio,
-                    created_at=start_time.isoformat(),
-                    due_date=due,
-                    duration_seconds=0,  # Duration will be counted up automatically
-                    remaining_seconds=0,  # Will be used to track elapsed time
-                )
-                self.tasks.append(new_task)
-                logging.info(f"Added task {new_task.id}: {new_task.title}")
-            else:
-                # update existing
-                task.title = title_text
-                task.description = description
-                task.priority = prio
-                task.due_date = due
-                # Keep the existing elapsed time (remaining_seconds) when editing
-                logging.info(f"Updated task {task.id}")
-
-            storage.save_tasks(TASKS_PATH, self.tasks)
+        # the dialog is built on first use and then only re-shown
+        if self.task_dialog is None:
+            self.task_dialog = TaskDialog(self)
+        self.task_dialog.open(task)
+
+    def _open_report(self):
+        if self.report_window is None:
+            self.report_window = ReportWindow(self)
+        self.report_window.open()
+
+    def _save_task(self, task, title_text, description, prio, due):
+        if task is None:
+            # ids come from the store so other processes can't reuse them
+            new_id = store.allocate_ids(TASKS_PATH, 1, self.repo.next_id())
+            new_task = Task(
+                id=new_id,
+                title=title_text,
+                description=description,
+                status="pending",
+                priority=prio,
+                created_at=datetime.now().isoformat(),
+                due_date=due,
+                duration_seconds=0,  # Duration will be counted up automatically
+                remaining_seconds=0,  # Will be used to track elapsed time
+            )
+            self.repo.add(new_task)
+            self.history.record(add_entry(new_task))
+            logging.info(f"Added task {new_task.id}: {new_task.title}")
+            self._start_timer(new_task)
+            self._persist(new_task)
             self._render_tasks()
-            win.destroy()
-
-        save_btn.config(command=on_save)
+            return
+        due_changed = due != task.due_date
+        before = self._snapshot(task)
+        task.title = title_text
+        task.description = description
+        task.priority = prio
+        task.due_date = due
+        # Keep the existing elapsed time (remaining_seconds) when editing
+        logging.info(f"Updated task {task.id}")
+        self._persist(task)
+        self.history.record(update_entry(before, task.to_dict()))
+        if due_changed and self.sort_by_due:
+            self._render_tasks()  # the task moves in the list
+        else:
+            self._refresh_task(task)
 
     def _mark_done(self, task: Task):
+        before = self._snapshot(task)
         task.status = "done"
-        task.remaining_seconds = 0
         # stop timer if running
         if task.id in self.timers:
-            self._stop_timer(task.id)
-        storage.save_tasks(TASKS_PATH, self.tasks)
-        self._render_tasks()
+            self._stop_timer(task, persist=False)
+        # tracked time is kept: remaining_seconds and sessions survive "done"
+        self._persist(task)
+        self.history.record(update_entry(before, task.to_dict()))
+        self._refresh_task(task)
 
     def _undo_done(self, task: Task):
+        before = self._snapshot(task)
         task.status = "pending"
         # restore remaining to duration if zero
         if task.remaining_seconds == 0:
             task.remaining_seconds = task.duration_seconds
-        storage.save_tasks(TASKS_PATH, self.tasks)
-        self._render_tasks()
+        self._start_timer(task)
+        self._persist(task)
+        self.history.record(update_entry(before, task.to_dict()))
+        self._refresh_task(task)
 
     def _delete_task(self, task: Task):
+        from tkinter import messagebox
         if messagebox.askyesno("Delete", f"Delete task '{task.title}'?"):
             # stop timer if running
             if task.id in self.timers:
-                self._stop_timer(task.id)
-            self.tasks = [t for t in self.tasks if t.id != task.id]
-            storage.save_tasks(TASKS_PATH, self.tasks)
+                self._stop_timer(task, persist=False)
+            self.history.record(delete_entry(task))
+            if self._unarchive(task.id):
+                storage.remove_archived(TASKS_PATH, [task])
+            self.repo.remove(task.id)
+            self.search_index.remove(task.id)
+            self.writer.delete(task.id)
+            self._render_tasks()
+
+    # ---------- External changes ----------
+    @timed("ui.watch_store")
+    def _watch_store(self):
+        changes = self.watcher.changes(self.repo)
+        if changes:
+            self._apply_store_changes(changes)
+        self.root.after(WATCH_INTERVAL_MS, self._watch_store)
+
+    def _apply_store_changes(self, changes):
+        # tasks added/changed/removed by other processes (or merged by the
+        # writer); only the affected cards are touched unless the visible
+        # list itself changes. A task with a local edit still queued waits
+        # for the writer's merged record instead; a remote delete wins.
+        rerender = False
+        refresh = []
+        for task_id, fresh in changes.items():
+            if fresh is not None and self.writer.is_pending(task_id):
+                continue
+            task = self.repo.get(task_id)
+            if fresh is None:
+                if task is not None:
+                    self.timers.stop(task_id)
+                    self.repo.remove(task_id)
+                    self.search_index.remove(task_id)
+                    rerender = rerender or task_id in self.visible_ids
+                continue
+            if task is None:
+                self._unarchive(task_id)  # edited elsewhere: it's a hot task again
+                task = self.repo.add(fresh)
+                self.search_index.add(task)
+                rerender = rerender or self._matches_filters(task)
+            elif task == fresh:
+                continue
+            else:
+                was_visible = task_id in self.visible_ids
+                moved = fresh.created_at != task.created_at or fresh.due_date != task.due_date
+                task.copy_from(fresh)
+                self.repo.update(task)
+                self.search_index.update(task)
+                if was_visible != self._matches_filters(task) or (was_visible and moved):
+                    rerender = True
+                elif was_visible:
+                    refresh.append(task)
+            if task.status == "done":
+                self._stop_timer(task)  # the time tracked here is still recorded
+            elif task_id not in self.timers:
+                self.timers.start(task_id, task.remaining_seconds)
+        logging.info(f"Applied {len(changes)} external task changes")
+        self._schedule_reminder()
+        if rerender:
             self._render_tasks()
+            return
+        for task in refresh:
+            for card in self.card_pool:
+                if card.task is task and card.row is not None:
+                    card.show(card.row, task)
+        self._update_stats()
+
+    def _persist(self, task: Task):
+        # re-index the changed task, then hand a snapshot of it to the
+        # background writer instead of rewriting tasks.json
+        if task.id in self.timers:
+            task.remaining_seconds = self.timers.elapsed(task.id)
+        unarchived = self._unarchive(task.id)
+        self.repo.update(task)
+        self.search_index.update(task)
+        self.writer.put(task)
+        if unarchived:
+            # the hot store is its only home now: once it's written there,
+            # drop the archived copy so a later delete can't resurrect it
+            self.writer.flush()
+            storage.remove_archived(TASKS_PATH, [task])
+        self._schedule_reminder()
+
+    # ---------- Due reminders ----------
+    def _schedule_reminder(self):
+        # a single pending `after`, armed for the earliest reminder in the
+        # due-date heap; re-armed whenever tasks change
+        if self.loading:
+            return
+        if self._reminder_after is not None:
+            self.root.after_cancel(self._reminder_after)
+            self._reminder_after = None
+        fire_at = self.repo.due.next_fire()
+        if fire_at is None:
+            return
+        delay = int((fire_at - datetime.now()).total_seconds() * 1000)
+        self._reminder_after = self.root.after(min(max(delay, 0), REMINDER_MAX_WAIT_MS),
+                                               self._fire_reminders)
+
+    def _fire_reminders(self):
+        self._reminder_after = None
+        events = self.repo.due.pop_events(datetime.now())
+        if events:
+            lines = []
+            for task_id, kind in events:
+                task = self.repo.get(task_id)
+                label = "Overdue" if kind == "overdue" else "Due today"
+                lines.append(f"{label}: {task.title} ({task.due_date})")
+                logging.info(f"Reminder for task {task_id}: {kind}")
+            shown = lines[:5] + ([f"…and {len(lines) - 5} more"] if len(lines) > 5 else [])
+            self.reminder_label.config(text="\n".join(shown))
+            self.root.bell()
+            self._update_stats()
+            # refresh the overdue markers on visible cards
+            for card in self.card_pool:
+                if card.row is not None:
+                    card.show(card.row, card.task)
+        self._schedule_reminder()
 
     # ---------- Timer controls ----------
     def _toggle_timer(self, task: Task):
         if task.id in self.timers:
             # pause
-            self._stop_timer(task.id)
-            storage.save_tasks(TASKS_PATH, self.tasks)
-            self._render_tasks()
+            self._stop_timer(task)
+            self._refresh_task(task)
         else:
             # start
             # if already done, do nothing
             if task.status == "done":
+                from tkinter import messagebox
                 messagebox.showinfo("Task is done", "This task is already marked done.")
                 return
             if task.remaining_seconds <= 0:
                 task.remaining_seconds = task.duration_seconds
             self._start_timer(task)
 
-    def _start_timer(self, task: Task):
-        def tick():
-            # increment elapsed time
-            for t in self.tasks:
-                if t.id == task.id:
-                    t.remaining_seconds = int(t.remaining_seconds + 1)
-                    break
-            # update label
-            lbl = self.timer_labels.get(task.id)
-            if lbl:
-                lbl.config(text=f"Time: {format_duration(task.remaining_seconds)}")
-            # schedule next tick if task is not done
-            if task.status != "done":
-                after_id = self.root.after(1000, tick)
-                self.timers[task.id] = after_id
+    def _schedule_tick(self):
+        self.root.after(1000, self._tick)
 
-        # start first tick
-        after_id = self.root.after(1000, tick)
-        self.timers[task.id] = after_id
+    @timed("ui.tick")
+    def _tick(self):
+        # one shared loop for all timers; only labels on screen are refreshed
+        for task_id, lbl in self.timer_labels.items():
+            if task_id in self.timers:
+                lbl.config(text=f"Time: {format_duration(self.timers.elapsed(task_id))}")
+        self._schedule_tick()
+
+    def _start_timer(self, task: Task):
+        if task.id in self.timers:
+            return
+        self.timers.start(task.id, task.remaining_seconds)
         logging.info(f"Started timer for task {task.id}")
 
-    def _stop_timer(self, task_id: int):
-        after_id = self.timers.get(task_id)
-        if after_id:
-            try:
-                self.root.after_cancel(after_id)
-            except Exception:
-                pass
-        if task_id in self.timers:
-            del self.timers[task_id]
-        logging.info(f"Stopped timer for task {task_id}")
+    def _stop_timer(self, task: Task, persist: bool = True):
+        if task.id not in self.timers:
+            return
+        # the run becomes a session; nothing is written while a timer ticks
+        record_session(task, self.timers.running_for(task.id))
+        task.remaining_seconds = self.timers.stop(task.id)
+        logging.info(f"Stopped timer for task {task.id}")
         # persist current remaining seconds
-        storage.save_tasks(TASKS_PATH, self.tasks)
+        if persist:
+            self._persist(task)
 
     def _reset_timer(self, task: Task):
+        before = self._snapshot(task)
         # stop if running
         if task.id in self.timers:
-            self._stop_timer(task.id)
+            self._stop_timer(task, persist=False)
         task.remaining_seconds = task.duration_seconds
-        storage.save_tasks(TASKS_PATH, self.tasks)
+        if task.status != "done":
+            self._start_timer(task)
+        self._persist(task)
+        self.history.record(update_entry(before, task.to_dict()))
+        self._refresh_task(task)
+
+    # ---------- Undo / redo ----------
+    def _snapshot(self, task: Task) -> dict:
+        # the task as the user sees it, including time on a running timer
+        d = task.to_dict()
+        if task.id in self.timers:
+            d["remaining_seconds"] = self.timers.elapsed(task.id)
+        return d
+
+    def _undo(self, _event=None):
+        entry = self.history.undo()
+        if entry is not None:
+            self._apply_history(entry, "before")
+
+    def _redo(self, _event=None):
+        entry = self.history.redo()
+        if entry is not None:
+            self._apply_history(entry, "after")
+
+    def _apply_history(self, entry: dict, side: str):
+        # side is "before" to undo an entry, "after" to redo it
+        task = self.repo.get(entry["id"])
+        state = entry.get(side)
+        if entry["op"] == "update":
+            if task is None:
+                logging.info(f"Task {entry['id']} no longer exists; skipping history step")
+                return
+            self._stop_timer(task, persist=False)
+            for name, value in state.items():
+                setattr(task, name, value)
+        elif state is None:
+            # undoing an add / redoing a delete
+            if task is None:
+                return
+            self.timers.stop(task.id)
+            self.repo.remove(task.id)
+            self.search_index.remove(task.id)
+            self.writer.delete(task.id)
+            self._render_tasks()
+            return
+        else:
+            # undoing a delete / redoing an add
+            if task is not None:
+                return
+            task = self.repo.add(Task.from_dict(state))
+            self.search_index.add(task)
+        if task.status != "done":
+            self._start_timer(task)
+        self._persist(task)
         self._render_tasks()
 
 # ---------- Run ----------
 def main():
+    logging.basicConfig(filename=LOG_PATH, level=logging.INFO,
+                        format="%(asctime)s %(levelname)s %(message)s")
     root = tk.Tk()
     app = TodoApp(root)
     root.protocol("WM_DELETE_WINDOW", lambda: on_close(root, app))
@@ -422,9 +990,24 @@ def main():
 
 def on_close(root, app: TodoApp):
     # stop timers and persist
-    for tid in list(app.timers.keys()):
-        app._stop_timer(tid)
-    storage.save_tasks(TASKS_PATH, app.tasks)
+    for task_id in app.timers.running_ids():
+        app._stop_timer(app.repo.get(task_id))
+    # final synchronous flush of everything still queued
+    app.writer.close()
+    # keep the next startup small: old done tasks move to the archive
+    try:
+        moved = storage.archive_done_tasks(TASKS_PATH, ARCHIVE_AFTER_DAYS)
+    except Exception:
+        logging.exception("Archiving done tasks failed; trying again next time")
+    else:
+        if moved:
+            logging.info(f"Archived {moved} done tasks")
+    if metrics.enabled:
+        metrics.dump(METRICS_PATH)
+    if metrics.profiling:
+        metrics.stop_profile(PROFILE_PATH)
+    logging.info(f"Saves requested: {app.writer.saves_requested}, "
+                 f"performed: {app.writer.saves_performed}")
     root.destroy()
 
 if __name__ == "__main__":
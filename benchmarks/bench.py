@@ -0,0 +1,308 @@
+"""Benchmarks for storage, filtering and rendering at several task counts.
+
+Run from the repository root::
+
+    python -m benchmarks.bench                        # 1k/10k/100k, stub Tk
+    python -m benchmarks.bench --sizes 1000 10000 --output results.json
+    python -m benchmarks.bench --baseline results.json  # flag regressions
+    xvfb-run python -m benchmarks.bench --tk real     # real widgets
+
+Each operation is timed (best of ``--repeat`` runs) and then run once more
+under tracemalloc for its peak memory. With ``--baseline`` the run is
+compared against an earlier ``--output`` file and the exit status is 1 when
+any operation got slower than the tolerance allows.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from todo import storage
+from todo.models import Task
+from todo.repository import TaskRepository
+from todo.search import SearchIndex
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+WORDS = ("replace", "keyboard", "battery", "assessment", "mobo", "screen", "laptop",
+         "clean", "fan", "install", "driver", "update", "backup", "ticket", "printer")
+
+# ---------- synthetic data ----------
+def make_tasks(n, seed=0, done_ratio=0.6):
+    """n Tasks shaped like a long-lived tasks.json (mostly done history)."""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    tasks = []
+    for i in range(1, n + 1):
+        created = start + timedelta(seconds=37 * i)
+        due = created + timedelta(days=rng.randint(0, 30)) if rng.random() < 0.5 else None
+        tasks.append(Task(
+            id=i,
+            title=" ".join(rng.sample(WORDS, 3)) + f" #{i}",
+            description=" ".join(rng.choices(WORDS, k=rng.randint(0, 8))),
+            status="done" if rng.random() < done_ratio else "pending",
+            priority=rng.choice(("low", "medium", "high")),
+            created_at=created.isoformat(),
+            due_date=due.strftime("%Y-%m-%d") if due else None,
+            duration_seconds=0,
+            remaining_seconds=rng.randint(0, 4 * 3600),
+        ))
+    return tasks
+
+# ---------- registry ----------
+BENCHMARKS = []
+
+def benchmark(name, needs_tk=False):
+    # setup(ctx) returns the zero-argument callable that gets timed
+    def register(setup):
+        BENCHMARKS.append((name, setup, needs_tk))
+        return setup
+    return register
+
+class Context:
+    def __init__(self, n, workdir, tk_mode):
+        self.n = n
+        self.workdir = workdir
+        self.tk_mode = tk_mode
+        self.tasks = make_tasks(n)
+        self.path = os.path.join(workdir, "tasks.json")
+        storage.save_tasks(self.path, self.tasks)
+
+@benchmark("save_tasks")
+def _bench_save(ctx):
+    path = os.path.join(ctx.workdir, "save.json")
+    return lambda: storage.save_tasks(path, ctx.tasks)
+
+@benchmark("load_tasks")
+def _bench_load(ctx):
+    return lambda: storage.load_tasks(ctx.path)
+
+@benchmark("iter_task_batches")
+def _bench_stream(ctx):
+    return lambda: sum(len(b) for b in storage.iter_task_batches(ctx.path))
+
+@benchmark("journal_put_task")
+def _bench_put(ctx):
+    path = os.path.join(ctx.workdir, "journal.json")
+    storage.save_tasks(path, [])
+    task = ctx.tasks[-1]
+    return lambda: storage.put_task(path, task)
+
+@benchmark("get_next_id")
+def _bench_next_id(ctx):
+    return lambda: storage.get_next_id(ctx.tasks)
+
+@benchmark("repository_build")
+def _bench_repo_build(ctx):
+    return lambda: TaskRepository(ctx.tasks)
+
+@benchmark("filter_sort")
+def _bench_filter(ctx):
+    repo = TaskRepository(ctx.tasks)
+    return lambda: repo.query("pending", "high", newest=True)
+
+@benchmark("search_index_build")
+def _bench_search_build(ctx):
+    return lambda: SearchIndex(ctx.tasks)
+
+@benchmark("search_query")
+def _bench_search(ctx):
+    index = SearchIndex(ctx.tasks)
+    return lambda: (index.search("battery"), index.search("fa"), index.search("key"))
+
+# ---------- UI (stub or real Tk) ----------
+def _import_app(tk_mode):
+    if tk_mode == "stub":
+        from benchmarks import tkstub
+        tkstub.install()
+    # app logs to todo.log only when started via app.main(); keep records off stderr
+    logging.basicConfig(handlers=[logging.NullHandler()])
+    import app
+    return app
+
+def _drain(root, app_obj):
+    if hasattr(root, "run_pending"):
+        root.run_pending()
+        return
+    while app_obj.loading:
+        root.update()
+    root.update()
+
+def _start_app(ctx):
+    app = _import_app(ctx.tk_mode)
+    app.TASKS_PATH = ctx.path
+    app.store = storage.get_backend(ctx.path)
+    root = app.tk.Tk()
+    todo_app = app.TodoApp(root)
+    _drain(root, todo_app)
+    return app, root, todo_app
+
+def _close_app(root, todo_app):
+    todo_app.writer.close()
+    if not hasattr(root, "run_pending"):
+        root.destroy()
+
+@benchmark("app_startup", needs_tk=True)
+def _bench_startup(ctx):
+    def run():
+        _, root, todo_app = _start_app(ctx)
+        _close_app(root, todo_app)
+    return run
+
+@benchmark("app_import", needs_tk=True)
+def _bench_import(ctx):
+    # a fresh interpreter each run: module-level imports and setup as a user pays them
+    code = "import app"
+    if ctx.tk_mode == "stub":
+        code = "from benchmarks import tkstub; tkstub.install(); " + code
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return lambda: subprocess.run([sys.executable, "-c", code], cwd=root_dir, check=True)
+
+@benchmark("app_shell", needs_tk=True)
+def _bench_shell(ctx):
+    # time until the window shell exists; tasks load afterwards from idle callbacks
+    app = _import_app(ctx.tk_mode)
+    app.TASKS_PATH = ctx.path
+    app.store = storage.get_backend(ctx.path)
+
+    def run():
+        root = app.tk.Tk()
+        todo_app = app.TodoApp(root)
+        _close_app(root, todo_app)
+    return run
+
+@benchmark("task_dialog_open", needs_tk=True)
+def _bench_dialog(ctx):
+    _, root, todo_app = _start_app(ctx)
+    ctx.cleanup.append(lambda: _close_app(root, todo_app))
+    task = todo_app.repo.all()[0]
+
+    def run():
+        # the first call builds the dialog, later ones only refill and re-show it
+        for _ in range(10):
+            todo_app._open_edit_window(task)
+            todo_app.task_dialog.close()
+    return run
+
+@benchmark("render_tasks", needs_tk=True)
+def _bench_render(ctx):
+    _, root, todo_app = _start_app(ctx)
+    ctx.cleanup.append(lambda: _close_app(root, todo_app))
+    return todo_app._render_tasks
+
+@benchmark("scroll_rebind_cards", needs_tk=True)
+def _bench_scroll(ctx):
+    app, root, todo_app = _start_app(ctx)
+    ctx.cleanup.append(lambda: _close_app(root, todo_app))
+    canvas = todo_app.task_canvas
+    rows = max(len(todo_app.visible_tasks) - 10, 1)
+
+    def run():
+        # scroll to the middle and back: every pooled card is rebound twice
+        for fraction in (0.5, 0.0):
+            if hasattr(canvas, "top"):
+                canvas.top = int(rows * fraction) * app.ROW_HEIGHT
+            else:
+                canvas.yview_moveto(fraction)
+            todo_app._layout_cards()
+    return run
+
+# ---------- measurement ----------
+def measure(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": best, "peak_kib": peak / 1024}
+
+def run_benchmarks(sizes, repeat, tk_mode, only=None):
+    results = {}
+    for n in sizes:
+        workdir = tempfile.mkdtemp(prefix="todo-bench-")
+        try:
+            ctx = Context(n, workdir, tk_mode)
+            for name, setup, needs_tk in BENCHMARKS:
+                if only and name not in only:
+                    continue
+                if needs_tk and tk_mode == "none":
+                    continue
+                ctx.cleanup = []
+                try:
+                    results.setdefault(name, {})[str(n)] = measure(setup(ctx), repeat)
+                finally:
+                    for cleanup in ctx.cleanup:
+                        cleanup()
+                r = results[name][str(n)]
+                print(f"{name:<22} n={n:<7} {r['seconds'] * 1000:10.2f} ms  "
+                      f"{r['peak_kib']:10.1f} KiB peak", flush=True)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+def compare(results, baseline, tolerance):
+    """List of regression messages for operations slower than baseline * (1 + tolerance)."""
+    regressions = []
+    for name, by_size in results.items():
+        for size, r in by_size.items():
+            old = baseline.get(name, {}).get(size)
+            if not old or old["seconds"] <= 0:
+                continue
+            ratio = r["seconds"] / old["seconds"]
+            if ratio > 1 + tolerance:
+                regressions.append(f"{name} n={size}: {old['seconds'] * 1000:.2f} ms -> "
+                                   f"{r['seconds'] * 1000:.2f} ms ({ratio:.2f}x)")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tk", choices=("stub", "real", "none"), default="stub",
+                        help="widget layer for UI benchmarks (real needs a display, e.g. xvfb-run)")
+    parser.add_argument("--only", nargs="+", help="run just these benchmarks")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against a previous --output file")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown vs baseline before flagging (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.repeat, args.tk, args.only)
+    if args.output:
+        payload = {
+            "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                     "tk": args.tk, "created": datetime.now().isoformat()},
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print("REGRESSION " + line)
+        if regressions:
+            return 1
+        print("No regressions against " + args.baseline)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""Minimal stand-in for tkinter so TodoApp can be benchmarked without a display.
+
+Widgets accept any options and ignore geometry calls; ``Tk.after`` callbacks
+are queued and run by ``Tk.run_pending`` in due order. Only enough behaviour
+is modelled for the app's own logic (filtering, card binding, timers) to
+execute; nothing is drawn.
+"""
+import itertools
+import sys
+import types
+
+_ids = itertools.count(1)
+
+class TclError(Exception):
+    pass
+
+class Widget:
+    def __init__(self, master=None, *args, **kw):
+        self.master = master
+        self.options = dict(kw)
+        self._path = f"{getattr(master, '_path', '')}.w{next(_ids)}"
+
+    def __str__(self):
+        return self._path
+
+    def __getattr__(self, name):
+        # grid/pack/bind/columnconfigure/... are accepted and ignored
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return lambda *args, **kw: None
+
+    def config(self, *args, **kw):
+        self.options.update(kw)
+
+    configure = config
+
+    def cget(self, key):
+        return self.options.get(key)
+
+    def winfo_height(self):
+        return 600
+
+    def winfo_width(self):
+        return 700
+
+class Tk(Widget):
+    def __init__(self, *args, **kw):
+        super().__init__(None)
+        self.now = 0
+        self._queue = {}
+        self._after_ids = itertools.count(1)
+
+    def after(self, ms, func=None, *args):
+        after_id = f"after#{next(self._after_ids)}"
+        self._queue[after_id] = (self.now + int(ms), next(self._after_ids), func, args)
+        return after_id
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def after_cancel(self, after_id):
+        self._queue.pop(after_id, None)
+
+    def run_pending(self, ms=0):
+        """Advance the fake clock by ``ms`` running every callback that falls due."""
+        end = self.now + ms
+        while True:
+            due = [(when, seq, key) for key, (when, seq, _, _) in self._queue.items() if when <= end]
+            if not due:
+                break
+            when, _, key = min(due)
+            self.now = max(self.now, when)
+            _, _, func, args = self._queue.pop(key)
+            func(*args)
+        self.now = end
+
+class Canvas(Widget):
+    def __init__(self, *args, **kw):
+        super().__init__(*args, **kw)
+        self.items = {}
+        self.top = 0
+
+    def create_window(self, *args, **kw):
+        item = next(_ids)
+        self.items[item] = dict(kw)
+        return item
+
+    def itemconfigure(self, item, **kw):
+        self.items[item].update(kw)
+
+    def coords(self, item, *xy):
+        self.items[item]["coords"] = xy
+
+    def canvasy(self, y):
+        return self.top + y
+
+    def yview_moveto(self, fraction):
+        self.top = 0
+
+class Variable:
+    def __init__(self, master=None, value=""):
+        self._value = value
+        self._traces = []
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+        for callback in self._traces:
+            callback("", "", "write")
+
+    def trace_add(self, mode, callback):
+        self._traces.append(callback)
+        return f"trace{len(self._traces)}"
+
+class OptionMenu(Widget):
+    def __init__(self, master, variable, default=None, *values, **kw):
+        super().__init__(master, **kw)
+        self.variable = variable
+
+def install():
+    """Register the stub as ``tkinter`` (and submodules) in sys.modules."""
+    tk = types.ModuleType("tkinter")
+    tk.TclError = TclError
+    tk.Tk = Tk
+    tk.Canvas = Canvas
+    tk.StringVar = tk.BooleanVar = tk.IntVar = Variable
+    tk.Toplevel = tk.Label = tk.Frame = tk.Button = tk.Entry = tk.Text = tk.Menu = Widget
+    tk.END = "end"
+
+    ttk = types.ModuleType("tkinter.ttk")
+    ttk.Frame = ttk.Label = ttk.Button = ttk.Entry = ttk.Scrollbar = ttk.Style = Widget
+    ttk.Checkbutton = ttk.Combobox = ttk.Notebook = ttk.Treeview = ttk.Separator = Widget
+    ttk.OptionMenu = OptionMenu
+
+    messagebox = types.ModuleType("tkinter.messagebox")
+    messagebox.askyesno = lambda *a, **kw: True
+    messagebox.showwarning = messagebox.showinfo = messagebox.showerror = lambda *a, **kw: None
+
+    scrolledtext = types.ModuleType("tkinter.scrolledtext")
+    scrolledtext.ScrolledText = Widget
+
+    tk.ttk, tk.messagebox, tk.scrolledtext = ttk, messagebox, scrolledtext
+    sys.modules.update({
+        "tkinter": tk,
+        "tkinter.ttk": ttk,
+        "tkinter.messagebox": messagebox,
+        "tkinter.scrolledtext": scrolledtext,
+    })
+    return tk
@@ -0,0 +1,70 @@
+import json
+import pytest
+from todo import storage
+from todo.cli import main
+from todo.models import Task
+
+def test_import_update_export_round_trip(tmp_path):
+    store = str(tmp_path / "tasks.json")
+    src = tmp_path / "in.csv"
+    src.write_text("title,priority,status,due_date\nA,high,,2025-01-01\nB,low,done,\nC,high,,\n",
+                   encoding="utf-8")
+    assert main(["--store", store, "import", str(src)]) == 0
+    tasks = storage.load_tasks(store)
+    assert [(t.id, t.title, t.priority, t.due_date) for t in tasks] == [
+        (1, "A", "high", "2025-01-01"), (2, "B", "low", None), (3, "C", "high", None)]
+    # imported rows go to the journal; the snapshot is not rewritten per task
+    with open(storage.journal_path(store), encoding="utf-8") as f:
+        assert len(f.readlines()) == 3
+
+    assert main(["--store", store, "update", "--priority", "high", "--set-status", "done"]) == 0
+    assert [t.status for t in storage.load_tasks(store)] == ["done", "done", "done"]
+
+    out = tmp_path / "out.jsonl"
+    assert main(["--store", store, "export", str(out), "--search", "c"]) == 0
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [r["title"] for r in rows] == ["C"]
+
+def test_import_rejects_bad_rows(tmp_path):
+    store = str(tmp_path / "tasks.json")
+    src = tmp_path / "in.jsonl"
+    src.write_text('{"title": "ok"}\n{"title": "bad", "priority": "urgent"}\n', encoding="utf-8")
+    with pytest.raises(SystemExit, match="row 2"):
+        main(["--store", store, "import", str(src)])
+    assert storage.load_tasks(store) == []
+
+@pytest.mark.parametrize("line, message", [
+    ('["not", "an", "object"]', "JSON object"),
+    ('{"title": "x", "remaining_seconds": "ten"}', "remaining_seconds"),
+    ('{"title": "x", "duration_seconds": 1.5e}', "invalid JSON"),
+    ('{"title": "x", "created_at": "yesterday"}', "created_at"),
+    ('{"title": "x", "sessions": "oops"}', "sessions"),
+])
+def test_import_reports_malformed_rows_by_number(tmp_path, line, message):
+    store = str(tmp_path / "tasks.json")
+    src = tmp_path / "in.jsonl"
+    src.write_text('{"title": "ok"}\n' + line + "\n", encoding="utf-8")
+    with pytest.raises(SystemExit, match=message):
+        main(["--store", store, "import", str(src)])
+
+def test_import_stores_created_at_in_local_time(tmp_path):
+    store = str(tmp_path / "tasks.json")
+    src = tmp_path / "in.csv"
+    src.write_text("title,created_at,remaining_seconds\nA,2020-01-01T00:00:00+00:00,30\n", encoding="utf-8")
+    assert main(["--store", store, "import", str(src)]) == 0
+    (task,) = storage.load_tasks(store)
+    assert task.created_dt.tzinfo is None and task.remaining_seconds == 30
+    assert storage.archive_done_tasks(store, 30) == 0  # comparable with naive cutoffs
+
+def test_report_totals_tracked_sessions(tmp_path, capsys):
+    store = str(tmp_path / "tasks.json")
+    storage.save_tasks(store, [
+        Task(id=1, title="Write", priority="high",
+             sessions=(("2025-01-06T09:00:00", "2025-01-06T10:00:00"),)),
+        Task(id=2, title="Review", status="done",
+             sessions=(("2025-01-06T09:30:00", "2025-01-06T10:00:00"),)),
+    ])
+    assert main(["--store", store, "report", "--days", "0", "--by", "task"]) == 0
+    out = capsys.readouterr().out.splitlines()
+    assert out[0].split() == ["total", "1:00:00"]
+    assert [line.split()[1:] for line in out[1:]] == [["1", "Write"], ["2", "Review"]]
@@ -0,0 +1,40 @@
+from datetime import date, datetime
+import pytest
+from todo.due import DueIndex
+from todo.models import Task
+from todo.repository import TaskRepository
+from todo.utils import normalize_due_date
+
+def test_normalize_due_date():
+    assert normalize_due_date("20250925") == "2025-09-25"
+    assert normalize_due_date(" 2025-09-25 ") == "2025-09-25"
+    assert normalize_due_date("") is None
+    with pytest.raises(ValueError):
+        normalize_due_date("25/09/2025")
+
+def test_heap_events_with_lazy_deletion():
+    index = DueIndex()
+    index.update(Task(id=1, title="a", due_date="2025-09-20"))
+    index.update(Task(id=2, title="b", due_date="2025-09-25"))
+    index.update(Task(id=3, title="c", due_date="2025-09-22"))
+    # moving or finishing a task leaves stale heap entries that are skipped
+    index.update(Task(id=3, title="c", due_date="2025-10-01"))
+    index.update(Task(id=1, title="a", status="done", due_date="2025-09-20"))
+    assert index.next_fire() == datetime(2025, 9, 25)
+    assert index.order() == [2, 3]
+    # both of task 2's events have passed: only "overdue" is reported
+    assert index.pop_events(datetime(2025, 9, 27)) == [(2, "overdue")]
+    assert index.next_fire() == datetime(2025, 10, 1)
+    assert index.pop_events(datetime(2025, 10, 1, 9)) == [(3, "due")]
+
+def test_query_filters_and_sorts_by_due():
+    today = date.today().isoformat()
+    repo = TaskRepository([
+        Task(id=1, title="a", created_at="2025-01-01T00:00:00", due_date="2000-01-01"),
+        Task(id=2, title="b", created_at="2025-01-02T00:00:00"),
+        Task(id=3, title="c", created_at="2025-01-03T00:00:00", due_date=today),
+        Task(id=4, title="d", created_at="2025-01-04T00:00:00", due_date="2000-01-01", status="done"),
+    ])
+    assert [t.id for t in repo.query(due="overdue")] == [1]
+    assert [t.id for t in repo.query(due="today")] == [3]
+    assert [t.id for t in repo.query(by_due=True)] == [1, 3, 4, 2]
@@ -0,0 +1,33 @@
+from todo.history import History, add_entry, update_entry
+from todo.models import Task
+
+def test_update_entry_keeps_only_changed_fields():
+    before = Task(id=1, title="a", status="pending", created_at="2025-01-01T00:00:00", version=3).to_dict()
+    after = dict(before, status="done", version=4)
+    assert update_entry(before, after) == {"op": "update", "id": 1,
+                                           "before": {"status": "pending"}, "after": {"status": "done"}}
+    assert update_entry(before, before) is None
+
+def test_undo_redo_ring_buffer():
+    history = History(limit=3)
+    for i in range(5):
+        history.record(add_entry(Task(id=i, title=str(i))))
+    assert [history.undo()["id"] for _ in range(3)] == [4, 3, 2]
+    assert history.undo() is None  # older steps fell out of the buffer
+    assert history.redo()["id"] == 2
+    history.record(add_entry(Task(id=9, title="new")))
+    assert not history.can_redo()
+
+def test_history_survives_restart_and_log_is_compacted(tmp_path):
+    path = str(tmp_path / "tasks.json.history")
+    history = History(path, limit=2)
+    for i in range(10):
+        history.record(add_entry(Task(id=i, title=str(i))))
+    history.undo()
+    restored = History(path, limit=2)
+    assert restored.redo()["id"] == 9
+    assert restored.undo()["id"] == 9
+    assert restored.undo()["id"] == 8
+    assert restored.undo() is None
+    with open(path, encoding="utf-8") as f:
+        assert len(f.readlines()) < 10
@@ -0,0 +1,40 @@
+import json
+from todo.metrics import Metrics
+
+def test_disabled_metrics_are_pass_through():
+    m = Metrics(enabled=False)
+    def fn(x):
+        return x * 2
+    assert m.timed("fn")(fn) is fn
+    with m.timer("block"):
+        pass
+    assert m.snapshot() == {}
+
+def test_histograms_and_dump(tmp_path):
+    m = Metrics(enabled=True)
+    for ms in range(1, 101):
+        m.record("op", ms / 1000)
+    summary = m.snapshot()["op"]
+    assert summary["count"] == 100
+    assert 50 <= summary["p50_ms"] <= 51
+    assert 95 <= summary["p95_ms"] <= 96
+    assert summary["max_ms"] == 100
+
+    @m.timed("double")
+    def double(x):
+        return x * 2
+    assert double(3) == 6
+    with m.timer("block"):
+        pass
+    path = tmp_path / "metrics.json"
+    m.dump(str(path))
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert set(data["metrics"]) == {"op", "double", "block"}
+
+def test_profile_toggle(tmp_path):
+    m = Metrics()
+    path = str(tmp_path / "out.prof")
+    assert m.toggle_profile(path) is True
+    sum(range(1000))
+    assert m.toggle_profile(path) is False
+    assert (tmp_path / "out.prof").exists()
@@ -0,0 +1,34 @@
+import json
+from todo.models import Task
+
+def test_round_trip_and_defaults():
+    t = Task.from_dict({"id": "7", "title": "x", "duration_seconds": "30"})
+    assert t.id == 7
+    assert t.status == "pending"
+    assert t.priority == "low"
+    assert t.remaining_seconds == 30
+    assert t.version == 0
+    assert t.created_at is not None
+    assert Task.from_dict(t.to_dict()) == t
+    assert list(t.to_dict()) == ["id", "title", "description", "status", "priority",
+                                 "created_at", "due_date", "duration_seconds", "remaining_seconds",
+                                 "version", "sessions"]
+    assert t.sessions == ()
+    tracked = Task.from_dict({"id": 1, "title": "x",
+                              "sessions": [["2025-01-01T09:00:00", "2025-01-01T10:00:00"]]})
+    assert tracked.sessions == (("2025-01-01T09:00:00", "2025-01-01T10:00:00"),)
+    assert Task.from_dict(json.loads(json.dumps(tracked.to_dict()))) == tracked
+
+def test_slots_and_interning():
+    a = Task.from_dict({"id": 1, "title": "a", "status": "".join(["do", "ne"])})
+    b = Task.from_dict({"id": 2, "title": "b", "status": "".join(["do", "ne"])})
+    assert a.status is b.status
+    assert not hasattr(a, "__dict__")
+
+def test_created_dt_is_cached_and_tracks_changes():
+    t = Task(id=1, title="x", created_at="2025-09-25T15:21:35.329153")
+    assert t.created_dt.year == 2025
+    t.created_at = "2024-01-02T00:00:00"
+    assert t.created_dt.year == 2024
+    t.created_at = "not a date"
+    assert t.created_dt is None
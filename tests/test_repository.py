@@ -0,0 +1,59 @@
+from todo.models import Task
+from todo.repository import TaskRepository
+
+def make_repo():
+    return TaskRepository([
+        Task(id=1, title="a", priority="high", created_at="2025-01-01T00:00:00"),
+        Task(id=2, title="b", priority="low", status="done", created_at="2025-01-03T00:00:00"),
+        Task(id=3, title="c", priority="high", status="done", created_at="2025-01-02T00:00:00"),
+    ])
+
+def test_lookup_and_ids():
+    repo = make_repo()
+    assert repo.get(2).title == "b"
+    assert repo.next_id() == 4
+    repo.remove(3)
+    # ids are never reused
+    assert repo.allocate_id() == 4
+    assert repo.next_id() == 5
+
+def test_query_filters_and_order():
+    repo = make_repo()
+    assert [t.id for t in repo.query()] == [2, 3, 1]
+    assert [t.id for t in repo.query(newest=False)] == [1, 3, 2]
+    assert [t.id for t in repo.query(status="done")] == [2, 3]
+    assert [t.id for t in repo.query(status="done", priority="high")] == [3]
+    assert repo.count(status="done", priority="high") == 1
+
+def test_update_reindexes():
+    repo = make_repo()
+    task = repo.get(1)
+    task.status = "done"
+    task.priority = "low"
+    repo.update(task)
+    assert repo.count(status="pending") == 0
+    assert [t.id for t in repo.query(priority="low")] == [2, 1]
+    assert repo.count(status="done", priority="high") == 1
+    repo.remove(1)
+    assert len(repo) == 2
+    assert [t.id for t in repo.query()] == [2, 3]
+
+def test_query_restricted_to_ids():
+    repo = make_repo()
+    assert [t.id for t in repo.query(ids={1, 3, 99})] == [3, 1]
+    assert [t.id for t in repo.query(status="done", ids={1, 3})] == [3]
+
+def test_update_keeps_iteration_order():
+    repo = make_repo()
+    task = repo.get(1)
+    task.status = "done"
+    repo.update(task)
+    assert [t.id for t in repo] == [1, 2, 3]
+
+def test_add_many_replaces_repeated_ids():
+    repo = make_repo()
+    repo.add_many([Task(id=4, title="d", created_at="2025-01-04T00:00:00"),
+                   Task(id=2, title="b2", priority="high", created_at="2025-01-03T00:00:00")])
+    assert repo.get(2).title == "b2"
+    assert repo.count(priority="high") == 3
+    assert [t.id for t in repo.query()] == [4, 2, 3, 1]
@@ -0,0 +1,50 @@
+from todo.models import Task
+from todo.search import SearchIndex
+
+def make_index():
+    return SearchIndex([
+        Task(id=1, title="Replace keyboard", description="X270 laptop"),
+        Task(id=2, title="Battery assessment", description="for ms lecel"),
+        Task(id=3, title="Mobo replacement"),
+    ])
+
+def test_substring_matches_title_and_description():
+    index = make_index()
+    assert index.search("replace") == {1, 3}
+    assert index.search("LAPTOP") == {1}
+    assert index.search("ss") == {2}
+    assert index.search("x") == {1}
+    assert index.search("nothing here") == set()
+    assert index.search("") == {1, 2, 3}
+
+def test_query_does_not_span_title_and_description():
+    index = make_index()
+    assert index.search("keyboardx270") == set()
+    assert index.search("dx") == set()
+
+def test_prefix_search():
+    index = make_index()
+    assert index.search_prefix("repl") == {1, 3}
+    assert index.search_prefix("lec") == {2}
+    assert index.search_prefix("zzz") == set()
+
+def test_incremental_update_and_remove():
+    index = make_index()
+    task = Task(id=1, title="Clean fan", description="")
+    index.update(task)
+    assert index.search("keyboard") == set()
+    assert index.search_prefix("keyb") == set()
+    assert index.search("fan") == {1}
+    index.remove(3)
+    assert index.search("replace") == set()
+    assert len(index) == 2
+
+def test_matches_plain_substring_scan():
+    tasks = [Task(id=i, title=f"fix #{i} {w}", description=d)
+             for i, (w, d) in enumerate([("laptop fan", "noisy-fan"), ("Printer", "jam, again"),
+                                         ("fan", ""), ("backup", "weekly fan check")], 1)]
+    index = SearchIndex(tasks)
+    for q in ["fan", "n c", "-fa", "#2", "FIX #", "ter", "p", "jam, a", ", ", "weekly fan x"]:
+        expected = {t.id for t in tasks
+                    if q.strip().lower() in t.title.lower() or q.strip().lower() in t.description.lower()}
+        assert index.search(q) == expected, q
@@ -0,0 +1,139 @@
+import asyncio
+import json
+from todo import server, storage
+from todo.models import Task
+
+def _service(tmp_path, tasks=()):
+    p = str(tmp_path / "tasks.json")
+    storage.save_tasks(p, list(tasks))
+    return server.TodoService(p, window=0.01), p
+
+def _call(service, method, target, body=None, **headers):
+    data = json.dumps(body).encode() if body is not None else b""
+    return service.handle(method, target, {k.replace("_", "-"): v for k, v in headers.items()}, data)
+
+def test_crud_round_trip_persists(tmp_path):
+    service, p = _service(tmp_path)
+    status, headers, created = _call(service, "POST", "/tasks",
+                                     {"title": "Write report", "priority": "high", "due_date": "20250301"})
+    assert status == 201 and headers["Location"] == f"/tasks/{created['id']}"
+    assert created["due_date"] == "2025-03-01" and created["running"] is False
+    task_id = created["id"]
+    status, _, updated = _call(service, "PATCH", f"/tasks/{task_id}", {"status": "done"})
+    assert status == 200 and updated["status"] == "done"
+    assert _call(service, "PATCH", f"/tasks/{task_id}", {"priority": "urgent"})[0] == 400
+    assert _call(service, "POST", "/tasks", {"description": "no title"})[0] == 400
+    assert _call(service, "POST", "/tasks", {"title": 5})[0] == 400
+    assert _call(service, "POST", "/tasks", {"title": "x", "description": ["a"]})[0] == 400
+    assert _call(service, "PATCH", f"/tasks/{task_id}", {"title": True})[0] == 400
+    assert _call(service, "GET", "/tasks/999")[0] == 404
+    service.writer.flush()
+    assert [t.status for t in storage.load_tasks(p)] == ["done"]
+    assert _call(service, "DELETE", f"/tasks/{task_id}")[0] == 204
+    service.close()
+    assert storage.load_tasks(p) == []
+
+def test_list_filters_pages_and_etag(tmp_path):
+    tasks = [Task(id=i, title=f"task {i}", priority="high" if i % 2 else "low",
+                  created_at=f"2025-01-{i:02d}T00:00:00") for i in range(1, 11)]
+    service, _ = _service(tmp_path, tasks)
+    status, headers, page = _call(service, "GET", "/tasks?priority=high&limit=2&offset=1")
+    assert status == 200 and page["total"] == 5
+    assert [t["id"] for t in page["tasks"]] == [7, 5]
+    etag = headers["ETag"]
+    assert _call(service, "GET", "/tasks?priority=high", if_none_match=etag)[0] == 304
+    assert _call(service, "GET", "/tasks?search=task 3")[2]["total"] == 1
+    assert _call(service, "GET", "/tasks?sort=sideways")[0] == 400
+    _call(service, "PATCH", "/tasks/1", {"title": "renamed"})
+    status, headers, _ = _call(service, "GET", "/tasks", if_none_match=etag)
+    assert status == 200 and headers["ETag"] != etag
+    service.close()
+
+def test_timer_start_stop_keeps_tracked_time(tmp_path):
+    service, p = _service(tmp_path, [Task(id=1, title="One", remaining_seconds=30)])
+    now = [100.0]
+    service.timers._clock = lambda: now[0]
+    assert _call(service, "POST", "/tasks/1/timer/start")[2]["running"] is True
+    now[0] += 15
+    status, _, body = _call(service, "POST", "/tasks/1/timer/stop")
+    assert status == 200 and body["remaining_seconds"] == 45 and body["running"] is False
+    assert len(body["sessions"]) == 1  # one start/stop, one recorded session
+    _call(service, "PATCH", "/tasks/1", {"status": "done"})
+    assert _call(service, "POST", "/tasks/1/timer/start")[0] == 409
+    service.close()
+    # marking done keeps the tracked time
+    assert storage.load_tasks(p)[0].remaining_seconds == 45
+
+def test_poll_store_picks_up_external_edits(tmp_path):
+    service, p = _service(tmp_path, [Task(id=1, title="One")])
+    etag = service.etag
+    storage.apply_changes(p, [Task(id=2, title="From the CLI").to_dict()])
+    assert service.poll_store() == 1
+    assert service.etag != etag
+    assert _call(service, "GET", "/tasks/2")[2]["title"] == "From the CLI"
+    service.close()
+
+def test_http_keep_alive_over_a_socket(tmp_path):
+    p = str(tmp_path / "tasks.json")
+    storage.save_tasks(p, [Task(id=1, title="One")])
+
+    async def scenario():
+        started = asyncio.get_running_loop().create_future()
+        serving = asyncio.ensure_future(server.serve(p, port=0, ready=started.set_result))
+        srv = await started
+        port = srv.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        body = b'{"title": "Two"}'
+        writer.write(b"POST /tasks HTTP/1.1\r\nHost: x\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+        writer.write(b"GET /tasks?limit=1 HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+        await writer.drain()
+        raw = await reader.read()
+        writer.close()
+        serving.cancel()
+        try:
+            await serving
+        except asyncio.CancelledError:
+            pass
+        return raw
+
+    raw = asyncio.run(scenario()).decode()
+    assert raw.startswith("HTTP/1.1 201 Created")
+    assert "HTTP/1.1 200 OK" in raw and '"total": 2' in raw
+    assert [t.title for t in storage.load_tasks(p)] == ["One", "Two"]
+
+def test_bad_content_length_gets_400(tmp_path):
+    p = str(tmp_path / "tasks.json")
+    storage.save_tasks(p, [])
+
+    async def scenario():
+        started = asyncio.get_running_loop().create_future()
+        serving = asyncio.ensure_future(server.serve(p, port=0, ready=started.set_result))
+        port = (await started).sockets[0].getsockname()[1]
+        replies = []
+        for length in (b"abc", b"-5"):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"POST /tasks HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n")
+            await writer.drain()
+            replies.append(await reader.read())
+            writer.close()
+        serving.cancel()
+        try:
+            await serving
+        except asyncio.CancelledError:
+            pass
+        return replies
+
+    for raw in asyncio.run(scenario()):
+        assert raw.startswith(b"HTTP/1.1 400 Bad Request")
+
+def test_poll_store_applies_remote_delete_of_a_pending_edit(tmp_path):
+    p = str(tmp_path / "tasks.json")
+    storage.save_tasks(p, [Task(id=1, title="One")])
+    service = server.TodoService(p, window=60)
+    _call(service, "PATCH", "/tasks/1", {"title": "renamed"})
+    assert service.writer.is_pending(1)
+    storage.apply_changes(p, deletes=[1])
+    assert service.poll_store() == 1
+    assert _call(service, "GET", "/tasks/1")[0] == 404
+    service.close()
+    assert storage.load_tasks(p) == []
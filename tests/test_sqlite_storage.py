@@ -0,0 +1,81 @@
+import threading
+from todo import sqlite_storage, storage
+from todo.models import Task
+
+def test_save_load_and_row_ops(tmp_path):
+    db = str(tmp_path / "tasks.db")
+    sqlite_storage.save_tasks(db, [Task(id=1, title="One"), Task(id=2, title="Two", priority="high")])
+    assert [t.title for t in sqlite_storage.load_tasks(db)] == ["One", "Two"]
+    assert sqlite_storage.get_next_id(db) == 3
+    sqlite_storage.put_task(db, Task(id=1, title="One edited", status="done"))
+    sqlite_storage.delete_task(db, 2)
+    loaded = sqlite_storage.load_tasks(db)
+    assert [(t.id, t.title, t.status) for t in loaded] == [(1, "One edited", "done")]
+
+def test_paged_filtered_query(tmp_path):
+    db = str(tmp_path / "tasks.db")
+    tasks = [Task(id=i, title=f"task {i}", priority="high" if i % 2 else "low",
+                  created_at=f"2025-01-01T00:00:{i:02d}") for i in range(1, 21)]
+    sqlite_storage.save_tasks(db, tasks)
+    page = sqlite_storage.query_tasks(db, priority="high", limit=3, offset=1)
+    assert [t.id for t in page] == [17, 15, 13]
+    assert sqlite_storage.count_tasks(db, priority="high") == 10
+    assert [t.id for t in sqlite_storage.query_tasks(db, search="TASK 1", newest=False, limit=2)] == [1, 10]
+
+def test_migrate_from_json(tmp_path):
+    src = str(tmp_path / "tasks.json")
+    storage.save_tasks(src, [Task(id=1, title="One")])
+    storage.put_task(src, Task(id=2, title="Two"))
+    db = str(tmp_path / "tasks.db")
+    assert sqlite_storage.migrate_from_json(src, db) == 2
+    assert [t.id for t in sqlite_storage.load_tasks(db)] == [1, 2]
+    assert storage.get_backend(db) is sqlite_storage
+    assert storage.get_backend(src) is storage
+
+def test_concurrent_edit_merged_by_version(tmp_path):
+    db = str(tmp_path / "tasks.db")
+    sqlite_storage.save_tasks(db, [Task(id=1, title="One")])
+    sync = sqlite_storage.StoreSync(db)
+    sync.mark()
+    # another connection (here: thread) commits an edit of version 0
+    remote_session = ("2025-01-01T09:00:00", "2025-01-01T09:01:00")
+    remote = threading.Thread(target=sqlite_storage.apply_changes,
+                              args=(db, [Task(id=1, title="One", remaining_seconds=60,
+                                              sessions=(remote_session,)).to_dict()]))
+    remote.start()
+    remote.join()
+    assert sync.poll()
+    assert sync.drain()[1]["remaining_seconds"] == 60
+    # an edit of the stale version 0 keeps its fields but not less tracked time
+    local_session = ("2025-01-02T09:00:00", "2025-01-02T09:00:30")
+    sqlite_storage.apply_changes(db, [Task(id=1, title="Renamed", sessions=(local_session,)).to_dict()],
+                                 sync=sync)
+    assert sync.drain()[1]["version"] == 2
+    (task,) = sqlite_storage.load_tasks(db)
+    assert (task.title, task.remaining_seconds, task.version) == ("Renamed", 60, 2)
+    assert task.sessions == (remote_session, local_session)
+    assert not sync.poll()
+    assert sqlite_storage.allocate_ids(db, 3) == 2
+    assert sqlite_storage.allocate_ids(db) == 5
+
+def test_undo_of_own_delete_is_written_but_remote_delete_wins(tmp_path):
+    db = str(tmp_path / "tasks.db")
+    sqlite_storage.save_tasks(db, [Task(id=1, title="One"), Task(id=2, title="Two"),
+                                   Task(id=3, title="Three")])
+    sync = sqlite_storage.StoreSync(db)
+    sync.mark()
+    (one, two, three) = sqlite_storage.load_tasks(db)
+    one.version = sqlite_storage.apply_changes(db, [one.to_dict()], sync=sync)[1]
+    # this process deletes task 1, then undo puts it back with its old version
+    sqlite_storage.apply_changes(db, deletes=[1], sync=sync)
+    assert sqlite_storage.apply_changes(db, [one.to_dict()], sync=sync) == {1: 2}
+    assert sync.drain() == {}
+    # another connection deletes task 2 while this one still edits it
+    remote = threading.Thread(target=sqlite_storage.apply_changes, args=(db, (), [2, 3]))
+    remote.start()
+    remote.join()
+    two.version = 1
+    assert three.version == 0  # never edited, so still at the version it was saved with
+    assert sqlite_storage.apply_changes(db, [two.to_dict(), three.to_dict()], sync=sync) == {}
+    assert sync.drain() == {2: None, 3: None}
+    assert [t.id for t in sqlite_storage.load_tasks(db)] == [1]
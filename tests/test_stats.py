@@ -0,0 +1,35 @@
+from datetime import date
+from todo.models import Task
+from todo.repository import TaskRepository
+from todo.stats import TaskStats
+
+TODAY = date(2025, 9, 25)
+
+def test_counters_follow_updates_and_removals():
+    stats = TaskStats([
+        Task(id=1, title="a", priority="high", due_date="2025-09-20", remaining_seconds=60),
+        Task(id=2, title="b", priority="high", due_date="20250925", remaining_seconds=120),
+        Task(id=3, title="c", priority="low", status="done", due_date="2025-09-01"),
+        Task(id=4, title="d", priority="medium", due_date="2025-10-30"),
+    ], today=TODAY)
+    assert (stats.by_status["pending"], stats.by_status["done"]) == (3, 1)
+    assert (stats.overdue, stats.by_due["today"], stats.by_due["later"]) == (1, 1, 1)
+    assert stats.tracked["high"] == 180 and stats.average_tracked("high") == 90
+    stats.update(Task(id=1, title="a", priority="high", status="done", remaining_seconds=300))
+    assert stats.overdue == 0
+    assert stats.pending_by_priority["high"] == 1
+    assert stats.tracked["high"] == 420
+    stats.remove(2)
+    assert stats.by_due["today"] == 0 and stats.tracked["high"] == 300
+    stats.set_today(date(2025, 11, 1))
+    assert stats.overdue == 1
+
+def test_repository_keeps_stats_current():
+    repo = TaskRepository([Task(id=1, title="a", priority="high")])
+    task = repo.get(1)
+    task.status = "done"
+    repo.update(task)
+    repo.add(Task(id=2, title="b"))
+    assert repo.stats.by_status["done"] == 1 and repo.stats.by_status["pending"] == 1
+    repo.remove(1)
+    assert repo.stats.by_status["done"] == 0 and len(repo.stats) == 1
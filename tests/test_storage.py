@@ -1,7 +1,15 @@
 import os
 import json
+import multiprocessing
 import tempfile
-from todo.storage import load_tasks, save_tasks, get_next_id
+import threading
+import time
+import pytest
+from todo.storage import (load_tasks, save_tasks, get_next_id, put_task,
+                          delete_task, maybe_compact, journal_path,
+                          BackgroundWriter, iter_task_batches, apply_changes,
+                          allocate_ids, StoreSync, fcntl, archive_done_tasks,
+                          archive_dir, load_archived_tasks, remove_archived)
 from todo.models import Task
 
 def test_save_and_load(tmp_path):
@@ -23,3 +31,254 @@ def test_get_next_id(tmp_path):
     assert get_next_id([]) == 1
     tlist = [Task(id=5, title="x")]
     assert get_next_id(tlist) == 6
+
+def test_journal_replay(tmp_path):
+    p = str(tmp_path / "tasks.json")
+    save_tasks(p, [Task(id=1, title="One"), Task(id=2, title="Two")])
+    put_task(p, Task(id=1, title="One edited", status="done"))
+    put_task(p, Task(id=3, title="Three"))
+    delete_task(p, 2)
+    loaded = load_tasks(p)
+    assert [t.id for t in loaded] == [1, 3]
+    assert loaded[0].title == "One edited"
+    assert loaded[0].status == "done"
+    # snapshot untouched until compaction
+    with open(p, encoding="utf-8") as f:
+        assert len(json.load(f)) == 2
+
+def test_journal_torn_line_is_dropped(tmp_path):
+    p = str(tmp_path / "tasks.json")
+    save_tasks(p, [])
+    put_task(p, Task(id=1, title="One"))
+    with open(journal_path(p), "a", encoding="utf-8") as f:
+        f.write('{"op":"put","task":{"id":2')
+    assert [t.id for t in load_tasks(p)] == [1]
+    put_task(p, Task(id=3, title="Three"))
+    assert [t.id for t in load_tasks(p)] == [1, 3]
+
+def test_compaction_folds_journal(tmp_path):
+    p = str(tmp_path / "tasks.json")
+    tasks = [Task(id=1, title="One")]
+    save_tasks(p, tasks)
+    put_task(p, tasks[0])
+    assert not maybe_compact(p, tasks, threshold=10_000)
+    assert maybe_compact(p, tasks, threshold=1)
+    assert not os.path.exists(journal_path(p))
+    assert [t.id for t in load_tasks(p)] == [1]
+
+def test_background_writer_coalesces(tmp_path):
+    p = str(tmp_path / "tasks.json")
+    save_tasks(p, [])
+    writer = BackgroundWriter(p, window=60)
+    task = Task(id=1, title="One")
+    for i in range(5):
+        task.remaining_seconds = i
+        writer.put(task)
+    writer.put(Task(id=2, title="Two"))
+    writer.delete(2)
+    # nothing is written until the window elapses or a flush
+    assert not os.path.exists(journal_path(p))
+    writer.close()
+    assert writer.saves_requested == 7
+    assert writer.saves_performed == 1
+    loaded = load_tasks(p)
+    assert [(t.id, t.remaining_seconds) for t in loaded] == [(1, 4)]
+
+def test_background_writer_writes_after_window(tmp_path):
+    p = str(tmp_path / "tasks.json")
+    save_tasks(p, [])
+    writer = BackgroundWriter(p, window=0.01)
+    writer.put(Task(id=1, title="One"))
+    for _ in range(200):
+        if writer.saves_performed:
+            break
+        time.sleep(0.01)
+    assert writer.saves_performed == 1
+    assert [t.id for t in load_tasks(p)] == [1]
+    writer.close()
+
+def test_edit_queued_during_a_write_builds_on_its_version(tmp_path):
+    p = str(tmp_path / "tasks.json")
+    save_tasks(p, [])
+    writing, release = threading.Event(), threading.Event()
+
+    class SlowBackend:
+        maybe_compact = staticmethod(maybe_compact)
+
+        @staticmethod
+        def apply_changes(path, puts, deletes=(), sync=None):
+            if not writing.is_set():
+                writing.set()
+                release.wait(5)
+            return apply_changes(path, puts, deletes, sync=sync)
+
+    writer = BackgroundWriter(p, SlowBackend(), window=0.01)
+    task = Task(id=1, title="A")
+    writer.put(task)
+    assert writing.wait(5)
+    task.title = "B"
+    writer.put(task)  # snapshot still says version 0
+    release.set()
+    writer.close()
+    with open(journal_path(p), encoding="utf-8") as f:
+        versions = [json.loads(line)["task"]["version"] for line in f]
+    assert versions == [1, 2]
+    assert task.version == 2
+
+def test_iter_task_batches_streams_snapshot_and_journal(tmp_path, monkeypatch):
+    p = str(tmp_path / "tasks.json")
+    save_tasks(p, [Task(id=i, title=f"task {i}", description="x" * 50) for i in range(1, 8)])
+    put_task(p, Task(id=2, title="edited"))
+    delete_task(p, 3)
+    put_task(p, Task(id=8, title="new"))
+    # tiny chunks force items to straddle read boundaries
+    monkeypatch.setattr("todo.storage.STREAM_CHUNK_SIZE", 16)
+    batches = list(iter_task_batches(p, batch_size=3))
+    assert [len(b) for b in batches] == [3, 3, 1]
+    streamed = [t for b in batches for t in b]
+    assert [(t.id, t.title) for t in streamed] == [(t.id, t.title) for t in load_tasks(p)]
+    assert streamed[1].title == "edited"
+
+def test_iter_task_batches_backs_up_corrupt_file(tmp_path):
+    p = str(tmp_path / "tasks.json")
+    with open(p, "w", encoding="utf-8") as f:
+        f.write('[{"id": 1, "title": "ok"}, {"id": 2, "tit')
+    streamed = [t for b in iter_task_batches(p) for t in b]
+    assert [t.id for t in streamed] == [1]
+    assert os.path.exists(p + ".bak")
+
+def test_concurrent_edits_are_merged(tmp_path):
+    p = str(tmp_path / "tasks.json")
+    save_tasks(p, [Task(id=1, title="One", remaining_seconds=10)])
+    a, b = StoreSync(p), StoreSync(p)
+    a.mark()
+    b.mark()
+    # both processes edit version 0 of task 1
+    s1, s2 = ("2025-01-01T09:00:00", "2025-01-01T09:01:20"), ("2025-01-02T08:00:00", "2025-01-02T08:00:10")
+    assert apply_changes(p, [Task(id=1, title="One", remaining_seconds=90, sessions=(s1,)).to_dict()],
+                         sync=a) == {1: 1}
+    written = apply_changes(p, [Task(id=1, title="Renamed", remaining_seconds=10, sessions=(s2,)).to_dict()],
+                            sync=b)
+    assert written == {1: 2}
+    merged = b.drain()[1]
+    assert (merged["title"], merged["remaining_seconds"], merged["version"]) == ("Renamed", 90, 2)
+    (task,) = load_tasks(p)
+    assert (task.title, task.remaining_seconds, task.version) == ("Renamed", 90, 2)
+    assert task.sessions == (s1, s2)  # neither side's tracked sessions are lost
+    # a sees b's record without reloading the store
+    assert a.poll()
+    assert a.drain()[1]["title"] == "Renamed"
+
+def test_delete_elsewhere_wins_and_compaction_needs_reload(tmp_path):
+    p = str(tmp_path / "tasks.json")
+    save_tasks(p, [Task(id=1, title="One"), Task(id=2, title="Two")])
+    a, b = StoreSync(p), StoreSync(p)
+    a.mark()
+    b.mark()
+    apply_changes(p, deletes=[1], sync=a)
+    assert apply_changes(p, [Task(id=1, title="edited", version=0).to_dict()], sync=b) == {}
+    assert b.drain() == {1: None}
+    assert [t.id for t in load_tasks(p)] == [2]
+    assert maybe_compact(p, threshold=1, sync=a)
+    assert not a.poll() and not a.needs_reload
+    assert b.poll() and b.needs_reload
+
+def test_put_dropped_for_a_remote_delete_is_reported_again(tmp_path):
+    p = str(tmp_path / "tasks.json")
+    save_tasks(p, [Task(id=1, title="One")])
+    a, b = StoreSync(p), StoreSync(p)
+    a.mark()
+    b.mark()
+    apply_changes(p, deletes=[1], sync=a)
+    assert b.poll() and b.drain() == {1: None}  # drained while b's edit was queued
+    assert apply_changes(p, [Task(id=1, title="edited").to_dict()], sync=b) == {}
+    assert b.drain() == {1: None}
+
+def test_stale_put_after_remote_compaction_is_merged(tmp_path):
+    p = str(tmp_path / "tasks.json")
+    save_tasks(p, [Task(id=1, title="One", remaining_seconds=5)])
+    a, b = StoreSync(p), StoreSync(p)
+    a.mark()
+    b.mark()
+    stale = load_tasks(p)[0]
+    # b edits and compacts: a can no longer see b's record in the journal
+    apply_changes(p, [Task(id=1, title="Renamed", remaining_seconds=500).to_dict()], sync=b)
+    assert maybe_compact(p, threshold=1, sync=b)
+    stale.description = "notes"
+    assert apply_changes(p, [stale.to_dict()], sync=a) == {1: 2}
+    assert a.drain()[1]["version"] == 2
+    (task,) = load_tasks(p)
+    assert (task.title, task.description, task.remaining_seconds, task.version) == ("One", "notes", 500, 2)
+
+def test_undo_of_own_delete_is_written(tmp_path):
+    p = str(tmp_path / "tasks.json")
+    save_tasks(p, [Task(id=1, title="One")])
+    sync = StoreSync(p)
+    sync.mark()
+    (task,) = load_tasks(p)
+    task.version = apply_changes(p, [task.to_dict()], sync=sync)[1]
+    apply_changes(p, deletes=[1], sync=sync)
+    # undo puts the deleted task back with the version it had
+    assert apply_changes(p, [task.to_dict()], sync=sync) == {1: 2}
+    assert sync.drain() == {}
+    assert [t.title for t in load_tasks(p)] == ["One"]
+
+def test_writer_bumps_task_version(tmp_path):
+    p = str(tmp_path / "tasks.json")
+    save_tasks(p, [])
+    sync = StoreSync(p)
+    sync.mark()
+    writer = BackgroundWriter(p, window=60, sync=sync)
+    task = Task(id=1, title="One")
+    writer.put(task)
+    writer.flush()
+    writer.put(task)
+    writer.close()
+    assert task.version == 2
+    assert load_tasks(p)[0].version == 2
+
+def _allocate_and_put(path, n):
+    for _ in range(n):
+        task_id = allocate_ids(path)
+        put_task(path, Task(id=task_id, title=f"task {task_id}"))
+
+@pytest.mark.skipif(fcntl is None, reason="advisory locks need fcntl")
+def test_processes_share_store_without_losing_tasks(tmp_path):
+    p = str(tmp_path / "tasks.json")
+    save_tasks(p, [])
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_allocate_and_put, args=(p, 25)) for _ in range(4)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    assert sorted(t.id for t in load_tasks(p)) == list(range(1, 101))
+    assert allocate_ids(p, 5, floor=1) == 101
+    assert allocate_ids(p, floor=500) == 500
+
+def test_archive_moves_old_done_tasks_to_monthly_partitions(tmp_path):
+    p = str(tmp_path / "tasks.json")
+    save_tasks(p, [
+        Task(id=1, title="old done", status="done", created_at="2024-01-05T10:00:00"),
+        Task(id=2, title="old pending", created_at="2024-01-06T10:00:00"),
+        Task(id=3, title="older done", status="done", created_at="2023-12-24T10:00:00"),
+        Task(id=4, title="recent done", status="done", created_at="2024-03-01T10:00:00"),
+    ])
+    from datetime import datetime
+    assert archive_done_tasks(p, max_age_days=30, now=datetime(2024, 3, 10)) == 2
+    assert sorted(os.listdir(archive_dir(p))) == ["2023-12.jsonl.gz", "2024-01.jsonl.gz"]
+    assert [t.id for t in load_tasks(p)] == [2, 4]
+    assert not os.path.exists(journal_path(p))
+    assert sorted(t.id for t in load_archived_tasks(p)) == [1, 3]
+    assert [t.id for t in load_archived_tasks(p, exclude=[1])] == [3]
+    remove_archived(p, [Task(id=3, title="", created_at="2023-12-24T10:00:00")])
+    assert [t.id for t in load_archived_tasks(p)] == [1]
+    # archived ids are never handed out again
+    assert allocate_ids(p) == 5
+
+def test_archive_compares_timezone_aware_created_at(tmp_path):
+    p = str(tmp_path / "tasks.json")
+    save_tasks(p, [Task(id=1, title="imported", status="done", created_at="2020-01-01T00:00:00+00:00"),
+                   Task(id=2, title="local", status="done", created_at="2020-01-01T00:00:00")])
+    assert archive_done_tasks(p, max_age_days=30) == 2
+    assert load_tasks(p) == []
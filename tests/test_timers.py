@@ -0,0 +1,29 @@
+from todo.timers import TimerScheduler
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+    def __call__(self):
+        return self.now
+
+def test_elapsed_is_computed_lazily():
+    clock = FakeClock()
+    timers = TimerScheduler(clock)
+    timers.start(1, accumulated=30)
+    assert 1 in timers
+    clock.now += 12.5
+    assert timers.elapsed(1) == 42
+    assert timers.running_for(1) == 12
+    assert timers.stop(1) == 42
+    assert 1 not in timers
+    # stopped timers fall back to the stored value
+    assert timers.elapsed(1, default=42) == 42
+
+def test_start_is_idempotent():
+    clock = FakeClock()
+    timers = TimerScheduler(clock)
+    timers.start(1)
+    clock.now += 5
+    timers.start(1, accumulated=100)
+    assert timers.elapsed(1) == 5
+    assert timers.running_ids() == [1]
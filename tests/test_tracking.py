@@ -0,0 +1,50 @@
+from datetime import date, datetime
+from todo.models import Task
+from todo.tracking import merge_intervals, record_session, seconds_by_day, summarize
+
+def dt(s):
+    return datetime.fromisoformat(s)
+
+def test_record_session_appends_and_coalesces_restarts():
+    task = Task(id=1, title="x")
+    assert not record_session(task, 0)
+    assert record_session(task, 600, end=dt("2025-01-06T10:00:00"))
+    assert task.sessions == (("2025-01-06T09:50:00", "2025-01-06T10:00:00"),)
+    # restarted straight away: the same session grows
+    record_session(task, 60, end=dt("2025-01-06T10:01:00"))
+    # later run: a new session
+    record_session(task, 30, end=dt("2025-01-06T12:00:00"))
+    assert task.sessions == (("2025-01-06T09:50:00", "2025-01-06T10:01:00"),
+                             ("2025-01-06T11:59:30", "2025-01-06T12:00:00"))
+
+def test_merge_intervals_and_midnight_split():
+    merged = merge_intervals([(dt("2025-01-01T10:00:00"), dt("2025-01-01T11:00:00")),
+                              (dt("2025-01-01T23:30:00"), dt("2025-01-02T00:30:00")),
+                              (dt("2025-01-01T10:30:00"), dt("2025-01-01T12:00:00")),
+                              (dt("2025-01-01T12:00:00"), dt("2025-01-01T12:15:00"))])
+    assert merged == [(dt("2025-01-01T10:00:00"), dt("2025-01-01T12:15:00")),
+                      (dt("2025-01-01T23:30:00"), dt("2025-01-02T00:30:00"))]
+    assert seconds_by_day(merged) == {date(2025, 1, 1): 2 * 3600 + 15 * 60 + 1800,
+                                      date(2025, 1, 2): 1800}
+
+def test_summarize_merges_concurrent_timers_per_group():
+    tasks = [
+        Task(id=1, title="a", priority="high",
+             sessions=(("2025-01-06T09:00:00", "2025-01-06T10:00:00"),)),
+        Task(id=2, title="b", priority="high",
+             sessions=(("2025-01-06T09:30:00", "2025-01-06T10:30:00"),
+                       ("2025-01-13T09:00:00", "2025-01-13T09:10:00"))),
+        Task(id=3, title="c", priority="low",
+             sessions=(("2025-01-05T09:00:00", "2025-01-05T09:20:00"), ("bad", "data"))),
+    ]
+    report = summarize(tasks)
+    assert report["total"] == 90 * 60 + 10 * 60 + 20 * 60
+    assert report["by_priority"] == {"high": 100 * 60, "low": 20 * 60}
+    assert report["by_task"] == {1: 3600, 2: 70 * 60, 3: 20 * 60}
+    assert report["by_week"] == {date(2024, 12, 30): 20 * 60, date(2025, 1, 6): 90 * 60,
+                                 date(2025, 1, 13): 10 * 60}
+    # clipped to a window, plus a timer that is still running
+    report = summarize(tasks, start=dt("2025-01-13T00:00:00"), running={3: 300},
+                       now=dt("2025-01-13T09:05:00"))
+    assert report["by_task"] == {2: 600, 3: 300}
+    assert report["total"] == 600
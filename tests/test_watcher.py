@@ -0,0 +1,36 @@
+from todo import storage
+from todo.models import Task
+from todo.repository import TaskRepository
+from todo.watcher import StoreWatcher, diff_tasks
+
+def test_diff_tasks_by_id():
+    def make(task_id, title):
+        return Task(id=task_id, title=title, created_at="2025-01-01T00:00:00")
+    repo = TaskRepository([make(1, "One"), make(2, "Two"), make(3, "Three")])
+    loaded = [make(1, "One"), make(2, "Two edited"), make(4, "Four")]
+    changes = diff_tasks(repo, loaded)
+    assert sorted(changes) == [2, 3, 4]
+    assert changes[2].title == "Two edited"
+    assert changes[3] is None
+
+def test_watcher_reads_appended_records_then_reloads_after_compaction(tmp_path):
+    p = str(tmp_path / "tasks.json")
+    storage.save_tasks(p, [Task(id=1, title="One"), Task(id=2, title="Two")])
+    sync = storage.StoreSync(p)
+    sync.mark()
+    repo = TaskRepository(storage.load_tasks(p))
+    watcher = StoreWatcher(p, storage, sync)
+    assert watcher.changes(repo) == {}
+    # another process edits, deletes and adds
+    storage.apply_changes(p, [Task(id=1, title="One edited").to_dict(),
+                              Task(id=3, title="Three").to_dict()], deletes=[2])
+    changes = watcher.changes(repo)
+    assert {tid: t and t.title for tid, t in changes.items()} == {1: "One edited", 2: None, 3: "Three"}
+    for tid, t in changes.items():
+        repo.remove(tid) if t is None else repo.update(t)
+    # a compaction elsewhere replaces the snapshot: diff the reloaded store
+    storage.put_task(p, Task(id=3, title="Three edited", version=1))
+    storage.maybe_compact(p, threshold=1)
+    changes = watcher.changes(repo)
+    assert list(changes) == [3] and changes[3].title == "Three edited"
+    assert not sync.needs_reload
@@ -0,0 +1,307 @@
+"""Command-line interface: ``python -m todo <command>``.
+
+Works directly on the task store (tasks.json or a SQLite .db) without Tk.
+Imports and bulk updates are written with one ``apply_changes`` call per
+batch instead of one save per task.
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+from datetime import date, datetime, timedelta
+from typing import Iterator, List, Optional
+from . import storage
+from .models import Task
+from .utils import format_duration, normalize_due_date
+
+STATUSES = ("pending", "done")
+PRIORITIES = ("high", "medium", "low")
+FIELDS = tuple(Task(id=0, title="").to_dict())
+INT_FIELDS = ("id", "duration_seconds", "remaining_seconds", "version")
+IMPORT_BATCH_SIZE = 5000
+
+def _open_in(path: str):
+    if path == "-":
+        return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+    return open(path, "r", encoding="utf-8", newline="")
+
+def _open_out(path: str):
+    if path == "-":
+        return io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline="", write_through=True)
+    return open(path, "w", encoding="utf-8", newline="")
+
+def _detect_format(path: str, fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+def _iter_rows(f, fmt: str) -> Iterator[dict]:
+    if fmt == "csv":
+        yield from csv.DictReader(f)
+        return
+    for lineno, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            raise SystemExit(f"line {lineno}: invalid JSON ({e})")
+
+def _clean_row(row: dict) -> dict:
+    if not isinstance(row, dict):
+        raise ValueError("expected a JSON object")
+    # CSV gives every column as a string; blank cells mean "use the default"
+    cleaned = {k: v for k, v in row.items() if k in FIELDS and v not in ("", None)}
+    if cleaned.get("status", "pending") not in STATUSES:
+        raise ValueError(f"invalid status {cleaned['status']!r}")
+    if cleaned.get("priority", "low") not in PRIORITIES:
+        raise ValueError(f"invalid priority {cleaned['priority']!r}")
+    if not cleaned.get("title"):
+        raise ValueError("title is required")
+    for name in INT_FIELDS:
+        if name in cleaned:
+            try:
+                cleaned[name] = int(cleaned[name])
+            except (TypeError, ValueError):
+                raise ValueError(f"{name} must be a whole number, got {cleaned[name]!r}")
+    if "created_at" in cleaned:
+        try:
+            created = datetime.fromisoformat(str(cleaned["created_at"]))
+        except ValueError:
+            raise ValueError(f"created_at must be an ISO timestamp, got {cleaned['created_at']!r}")
+        if created.tzinfo is not None:
+            created = created.astimezone().replace(tzinfo=None)  # stored in local time like the app's
+        cleaned["created_at"] = created.isoformat()
+    if "due_date" in cleaned:
+        cleaned["due_date"] = normalize_due_date(cleaned["due_date"])
+    if isinstance(cleaned.get("sessions"), str):
+        try:
+            cleaned["sessions"] = json.loads(cleaned["sessions"])
+        except ValueError:
+            raise ValueError("sessions must be a JSON list of [start, end] pairs")
+    sessions = cleaned.get("sessions", [])
+    if not isinstance(sessions, list) or not all(isinstance(x, list) and len(x) == 2 for x in sessions):
+        raise ValueError("sessions must be a JSON list of [start, end] pairs")
+    return cleaned
+
+def _matches(task: Task, status: str, priority: str, search: str) -> bool:
+    if status != "all" and task.status != status:
+        return False
+    if priority != "all" and task.priority != priority:
+        return False
+    q = search.strip().lower()
+    if q and q not in task.title.lower() and q not in (task.description or "").lower():
+        return False
+    return True
+
+def _iter_tasks(path: str) -> Iterator[Task]:
+    for batch in storage.get_backend(path).iter_task_batches(path):
+        yield from batch
+
+# ---------- commands ----------
+def cmd_import(args) -> int:
+    backend = storage.get_backend(args.store)
+    next_id = 1
+    for task in _iter_tasks(args.store):
+        next_id = max(next_id, task.id + 1)
+    fmt = _detect_format(args.file, args.format)
+    imported = 0
+    reserved_end = next_id  # ids up to here are reserved for this import
+    batch: List[dict] = []
+    with _open_in(args.file) as f:
+        for n, row in enumerate(_iter_rows(f, fmt), 1):
+            try:
+                cleaned = _clean_row(row)
+                task = Task.from_dict(cleaned)  # id 0 until one is allocated below
+            except (TypeError, ValueError) as e:
+                raise SystemExit(f"row {n}: {e}")
+            if "id" not in cleaned:
+                if next_id >= reserved_end:
+                    # reserve ids a block at a time so a running app can't reuse them
+                    next_id = backend.allocate_ids(args.store, args.batch_size, next_id)
+                    reserved_end = next_id + args.batch_size
+                task.id = next_id
+            next_id = max(next_id, task.id + 1)
+            batch.append(task.to_dict())
+            if len(batch) >= args.batch_size:
+                backend.apply_changes(args.store, batch)
+                imported += len(batch)
+                batch = []
+    if batch:
+        backend.apply_changes(args.store, batch)
+        imported += len(batch)
+    backend.allocate_ids(args.store, 0, next_id)  # explicit ids from the file are taken too
+    backend.maybe_compact(args.store)
+    print(f"Imported {imported} tasks into {args.store}", file=sys.stderr)
+    return 0
+
+def _csv_value(value):
+    return json.dumps(value) if isinstance(value, (list, tuple, dict)) else value
+
+def cmd_export(args) -> int:
+    fmt = _detect_format(args.file, args.format)
+    exported = 0
+    with _open_out(args.file) as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS) if fmt == "csv" else None
+        if writer:
+            writer.writeheader()
+        for task in _iter_tasks(args.store):
+            if not _matches(task, args.status, args.priority, args.search):
+                continue
+            d = task.to_dict()
+            if writer:
+                writer.writerow({k: _csv_value(v) for k, v in d.items()})
+            else:
+                f.write(json.dumps(d, ensure_ascii=False) + "\n")
+            exported += 1
+    print(f"Exported {exported} tasks", file=sys.stderr)
+    return 0
+
+def cmd_update(args) -> int:
+    if not (args.set_status or args.set_priority):
+        raise SystemExit("nothing to change: give --set-status and/or --set-priority")
+    ids = {int(x) for x in args.ids.split(",")} if args.ids else None
+    backend = storage.get_backend(args.store)
+    # edits made by other processes while we work are merged, not overwritten
+    sync = backend.StoreSync(args.store)
+    sync.mark()
+    changed = []
+    for task in _iter_tasks(args.store):
+        if ids is not None and task.id not in ids:
+            continue
+        if not _matches(task, args.status, args.priority, args.search):
+            continue
+        before = (task.status, task.priority)
+        if args.set_status:
+            task.status = args.set_status
+        if args.set_priority:
+            task.priority = args.set_priority
+        if (task.status, task.priority) != before:
+            changed.append(task.to_dict())
+    if changed:
+        backend.apply_changes(args.store, changed, sync=sync)
+        backend.maybe_compact(args.store, sync=sync)
+    print(f"Updated {len(changed)} tasks", file=sys.stderr)
+    return 0
+
+def cmd_list(args) -> int:
+    shown = 0
+    for task in _iter_tasks(args.store):
+        if not _matches(task, args.status, args.priority, args.search):
+            continue
+        due = f"  due {task.due_date}" if task.due_date else ""
+        print(f"{task.id:>6}  {task.status:<7}  {task.priority:<6}  {task.title}{due}")
+        shown += 1
+        if args.limit and shown >= args.limit:
+            break
+    return 0
+
+def cmd_report(args) -> int:
+    from .tracking import summarize
+    tasks = list(_iter_tasks(args.store))
+    tasks += storage.load_archived_tasks(args.store, exclude=(t.id for t in tasks))
+    start = None
+    if args.days:
+        start = datetime.combine(date.today() - timedelta(days=args.days - 1), datetime.min.time())
+    report = summarize(tasks, start=start)
+    titles = {t.id: t.title for t in tasks}
+    print(f"total  {format_duration(report['total'])}")
+    if args.by == "day":
+        rows = ((f"{day:%Y-%m-%d}", s) for day, s in report["by_day"].items())
+    elif args.by == "week":
+        rows = ((f"week of {monday:%Y-%m-%d}", s) for monday, s in report["by_week"].items())
+    elif args.by == "priority":
+        rows = report["by_priority"].items()
+    else:
+        rows = ((f"{tid:>6}  {titles.get(tid, '')}", s) for tid, s in report["by_task"].items())
+    for label, seconds in rows:
+        print(f"{format_duration(seconds):>10}  {label}")
+    return 0
+
+def cmd_archive(args) -> int:
+    moved = storage.archive_done_tasks(args.store, args.days)
+    print(f"Archived {moved} done tasks older than {args.days} days", file=sys.stderr)
+    return 0
+
+def cmd_serve(args) -> int:
+    import asyncio
+    from . import server
+
+    def ready(srv):
+        host, port = srv.sockets[0].getsockname()[:2]
+        print(f"Serving {args.store} on http://{host}:{port}", file=sys.stderr)
+
+    try:
+        asyncio.run(server.serve(args.store, args.host, args.port, ready=ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+def cmd_migrate(args) -> int:
+    from . import sqlite_storage
+    count = sqlite_storage.migrate_from_json(args.source, args.target)
+    print(f"Migrated {count} tasks to {args.target}", file=sys.stderr)
+    return 0
+
+# ---------- parser ----------
+def _add_filters(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--status", choices=("all",) + STATUSES, default="all")
+    p.add_argument("--priority", choices=("all",) + PRIORITIES, default="all")
+    p.add_argument("--search", default="", help="substring of title or description")
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m todo", description="To-Do Manager command line")
+    parser.add_argument("--store", default="tasks.json",
+                        help="task store: tasks.json or a .db/.sqlite file (default: %(default)s)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("import", help="bulk import tasks from CSV or JSON lines")
+    p.add_argument("file", help="input file, or - for stdin")
+    p.add_argument("--format", choices=("csv", "jsonl"), help="default: from the file extension")
+    p.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("export", help="export tasks as CSV or JSON lines")
+    p.add_argument("file", help="output file, or - for stdout")
+    p.add_argument("--format", choices=("csv", "jsonl"), help="default: from the file extension")
+    _add_filters(p)
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("update", help="bulk change status/priority of matching tasks")
+    _add_filters(p)
+    p.add_argument("--ids", help="comma-separated task ids to restrict to")
+    p.add_argument("--set-status", choices=STATUSES)
+    p.add_argument("--set-priority", choices=PRIORITIES)
+    p.set_defaults(func=cmd_update)
+
+    p = sub.add_parser("list", help="print matching tasks")
+    _add_filters(p)
+    p.add_argument("--limit", type=int, default=0)
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("report", help="tracked time per day, week, priority or task")
+    p.add_argument("--days", type=int, default=7, help="last N days including today; 0 for all (default: %(default)s)")
+    p.add_argument("--by", choices=("day", "week", "priority", "task"), default="day")
+    p.set_defaults(func=cmd_report)
+
+    p = sub.add_parser("archive", help="move old done tasks to the compressed archive")
+    p.add_argument("--days", type=int, default=storage.ARCHIVE_AFTER_DAYS,
+                   help="archive done tasks created more than this many days ago (default: %(default)s)")
+    p.set_defaults(func=cmd_archive)
+
+    p = sub.add_parser("serve", help="run the local HTTP/JSON API")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser("migrate", help="copy a tasks.json store into a SQLite database")
+    p.add_argument("source")
+    p.add_argument("target")
+    p.set_defaults(func=cmd_migrate)
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,94 @@
+import heapq
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
+from .models import Task
+from .utils import due_bucket, parse_due_date
+
+class DueIndex:
+    """Pending tasks with a due date, plus their reminder times in a min-heap.
+
+    Every task gets two events: "due" at the start of its due day and
+    "overdue" at the start of the next one. Changing or clearing a due date
+    does not search the heap; stale entries are skipped when they reach the
+    top (lazy deletion) and the heap is rebuilt once they dominate it.
+    """
+
+    def __init__(self):
+        self._due: Dict[int, date] = {}
+        self._heap: List[Tuple[datetime, int, date, str]] = []  # (fire_at, task_id, due, kind)
+        self._order: Optional[List[int]] = None  # ids by due date, rebuilt lazily
+        self._rank: Optional[Dict[int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def due_of(self, task_id: int) -> Optional[date]:
+        return self._due.get(task_id)
+
+    def update(self, task: Task) -> None:
+        due = parse_due_date(task.due_date) if task.status != "done" else None
+        if due == self._due.get(task.id):
+            return
+        self._order = self._rank = None
+        if due is None:
+            del self._due[task.id]
+            return
+        self._due[task.id] = due
+        start = datetime.combine(due, time.min)
+        heapq.heappush(self._heap, (start, task.id, due, "due"))
+        heapq.heappush(self._heap, (start + timedelta(days=1), task.id, due, "overdue"))
+        if len(self._heap) > 4 * len(self._due) + 64:
+            self._rebuild()
+
+    add = update
+
+    def remove(self, task_id: int) -> None:
+        if self._due.pop(task_id, None) is not None:
+            self._order = self._rank = None
+
+    def _rebuild(self) -> None:
+        self._heap = [entry for entry in self._heap if self._due.get(entry[1]) == entry[2]]
+        heapq.heapify(self._heap)
+
+    def _drop_stale(self) -> None:
+        heap = self._heap
+        while heap and self._due.get(heap[0][1]) != heap[0][2]:
+            heapq.heappop(heap)
+
+    def next_fire(self) -> Optional[datetime]:
+        """When the earliest pending reminder is due, or None."""
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_events(self, now: datetime) -> List[Tuple[int, str]]:
+        """(task_id, "due"/"overdue") for every reminder up to ``now``, in order.
+
+        A task whose "due" and "overdue" times have both passed (e.g. at
+        startup) only reports "overdue".
+        """
+        events: Dict[int, str] = {}
+        heap = self._heap
+        while True:
+            self._drop_stale()
+            if not heap or heap[0][0] > now:
+                break
+            _, task_id, _, kind = heapq.heappop(heap)
+            events.pop(task_id, None)
+            events[task_id] = kind
+        return list(events.items())
+
+    def order(self) -> List[int]:
+        # ids of pending tasks with a due date, soonest first
+        if self._order is None:
+            self._order = sorted(self._due, key=lambda tid: (self._due[tid], tid))
+        return self._order
+
+    def rank(self) -> Dict[int, int]:
+        # task id -> position in order(), for sorting other lists by due date
+        if self._rank is None:
+            self._rank = {tid: i for i, tid in enumerate(self.order())}
+        return self._rank
+
+    def ids_in(self, bucket: str, today: date) -> List[int]:
+        # pending task ids whose due date falls in a stats bucket
+        return [tid for tid in self.order() if due_bucket(self._due[tid], today) == bucket]
@@ -0,0 +1,118 @@
+import json
+import os
+from collections import deque
+from typing import Deque, List, Optional
+from .models import Task
+
+HISTORY_SUFFIX = ".history"
+HISTORY_LIMIT = 200  # undo steps kept; older ones fall out of the ring buffer
+
+_NOT_UNDONE = ("version", "sessions")
+
+def update_entry(before: dict, after: dict) -> Optional[dict]:
+    # only the fields the action changed, on both sides; None if nothing did.
+    # Tracked sessions are a log of time actually spent and are never undone.
+    changed = [k for k, v in after.items() if k not in _NOT_UNDONE and before.get(k) != v]
+    if not changed:
+        return None
+    return {"op": "update", "id": after["id"],
+            "before": {k: before.get(k) for k in changed},
+            "after": {k: after[k] for k in changed}}
+
+def add_entry(task: Task) -> dict:
+    return {"op": "add", "id": task.id, "after": task.to_dict()}
+
+def delete_entry(task: Task) -> dict:
+    return {"op": "delete", "id": task.id, "before": task.to_dict()}
+
+class History:
+    """Multi-level undo/redo of task mutations stored as small deltas.
+
+    Entries hold the task id and the changed fields only (a whole task for
+    add/delete), kept in a ring buffer of ``limit`` steps. With a ``path``
+    every push/undo/redo is appended to a JSON-lines log (next to the
+    journal, ``tasks.json.history``) and replayed on startup; the log is
+    rewritten from the buffers once it grows well past the limit.
+    """
+
+    def __init__(self, path: Optional[str] = None, limit: int = HISTORY_LIMIT):
+        self.path = path
+        self.limit = limit
+        self._undo: Deque[dict] = deque(maxlen=limit)
+        self._redo: List[dict] = []
+        self._lines = 0
+        if path is not None:
+            self._replay()
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def record(self, entry: Optional[dict]) -> None:
+        if entry is None:
+            return
+        self._push(entry)
+        self._log({"push": entry})
+
+    def undo(self) -> Optional[dict]:
+        """The entry to revert (apply its "before" side), or None."""
+        if not self._undo:
+            return None
+        entry = self._undo.pop()
+        self._redo.append(entry)
+        self._log({"undo": 1})
+        return entry
+
+    def redo(self) -> Optional[dict]:
+        """The entry to apply again (its "after" side), or None."""
+        if not self._redo:
+            return None
+        entry = self._redo.pop()
+        self._undo.append(entry)
+        self._log({"redo": 1})
+        return entry
+
+    def _push(self, entry: dict) -> None:
+        self._undo.append(entry)
+        self._redo.clear()
+
+    # ---------- persistence ----------
+    def _replay(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue  # torn trailing line
+                    self._lines += 1
+                    if "push" in event:
+                        self._push(event["push"])
+                    elif "undo" in event and self._undo:
+                        self._redo.append(self._undo.pop())
+                    elif "redo" in event and self._redo:
+                        self._undo.append(self._redo.pop())
+        except FileNotFoundError:
+            pass
+
+    def _log(self, event: dict) -> None:
+        if self.path is None:
+            return
+        if self._lines >= 4 * self.limit:
+            self._rewrite()  # the buffers already include this event
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(event, separators=(",", ":")) + "\n")
+        self._lines += 1
+
+    def _rewrite(self) -> None:
+        # push everything in chronological order, then undo the redo stack
+        events = [{"push": e} for e in list(self._undo) + self._redo[::-1]]
+        events.extend({"undo": 1} for _ in self._redo)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(e, separators=(",", ":")) + "\n" for e in events)
+        os.replace(tmp, self.path)
+        self._lines = len(events)
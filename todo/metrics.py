@@ -0,0 +1,138 @@
+"""Opt-in timing instrumentation for hot paths.
+
+Set ``TODO_METRICS=1`` before starting the app to enable it. While disabled,
+``timed`` returns the function untouched and ``timer`` hands out a shared
+no-op context manager, so instrumented code pays (almost) nothing.
+"""
+import contextlib
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+SAMPLE_WINDOW = 2048  # recent samples kept per histogram for percentiles
+
+class Histogram:
+    __slots__ = ("count", "total", "max", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=SAMPLE_WINDOW)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.samples.append(seconds)
+
+    def summary(self) -> dict:
+        ordered = sorted(self.samples)
+
+        def pct(p):
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "max_ms": self.max * 1000,
+        }
+
+class Metrics:
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Histogram] = {}
+        self._profiler: Optional[cProfile.Profile] = None
+        self._null = contextlib.nullcontext()
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            hist = self._histograms.get(name)
+            if hist is None:
+                hist = self._histograms[name] = Histogram()
+            hist.add(seconds)
+
+    @contextlib.contextmanager
+    def _timing(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timer(self, name: str):
+        """Context manager timing its block under ``name``."""
+        if not self.enabled:
+            return self._null
+        return self._timing(name)
+
+    def timed(self, name: str) -> Callable:
+        """Decorator timing each call under ``name``; a no-op when disabled."""
+        def decorate(fn):
+            if not self.enabled:
+                return fn
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {name: hist.summary() for name, hist in sorted(self._histograms.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def dump(self, path: str) -> None:
+        # atomic like storage.save_tasks so readers never see a partial file
+        payload = {"generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "metrics": self.snapshot()}
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+        os.replace(tmp, path)
+
+    # ---------- cProfile capture ----------
+    @property
+    def profiling(self) -> bool:
+        return self._profiler is not None
+
+    def start_profile(self) -> None:
+        if self._profiler is None:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop_profile(self, path: str) -> None:
+        # write pstats data readable with `python -m pstats <path>`
+        profiler, self._profiler = self._profiler, None
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(path)
+
+    def toggle_profile(self, path: str) -> bool:
+        if self.profiling:
+            self.stop_profile(path)
+        else:
+            self.start_profile()
+        return self.profiling
+
+metrics = Metrics(enabled=os.environ.get("TODO_METRICS", "") not in ("", "0"))
+timed = metrics.timed
+timer = metrics.timer
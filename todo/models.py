@@ -1,37 +1,117 @@
-from dataclasses import dataclass, asdict
+import sys
 from datetime import datetime
 from typing import Optional
 
-@dataclass
+def _intern(value):
+    return sys.intern(value) if value.__class__ is str else value
+
 class Task:
-    id: int
-    title: str
-    description: str = ""
-    status: str = "pending"   # "pending" or "done"
-    priority: str = "low"     # "low", "medium", "high"
-    created_at: str = None    # ISO timestamp
-    due_date: Optional[str] = None
-    duration_seconds: int = 0
-    remaining_seconds: int = 0
-
-    def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now().isoformat()
+    # Hand-written slotted class (rather than a dataclass) so that large task
+    # lists stay compact and (de)serialization avoids dataclasses.asdict.
+    __slots__ = (
+        "id",
+        "title",
+        "description",
+        "status",             # "pending" or "done"
+        "priority",           # "low", "medium", "high"
+        "created_at",         # ISO timestamp
+        "due_date",
+        "duration_seconds",
+        "remaining_seconds",
+        "version",            # bumped on every write; detects concurrent edits
+        "sessions",           # tracked time: ((start ISO, end ISO), ...), appended on timer stop
+        "_created_cache",     # (created_at, parsed datetime), filled lazily
+    )
+
+    def __init__(self, id: int, title: str, description: str = "", status: str = "pending",
+                 priority: str = "low", created_at: Optional[str] = None,
+                 due_date: Optional[str] = None, duration_seconds: int = 0,
+                 remaining_seconds: int = 0, version: int = 0, sessions=()):
+        self.id = id
+        self.title = title
+        self.description = description
+        # a handful of distinct values repeated across every task
+        self.status = _intern(status)
+        self.priority = _intern(priority)
+        self.created_at = created_at if created_at is not None else datetime.now().isoformat()
+        self.due_date = due_date
+        self.duration_seconds = duration_seconds
+        self.remaining_seconds = remaining_seconds
+        self.version = version
+        self.sessions = sessions  # a shared () for the many tasks never tracked
+        self._created_cache = None
+
+    def __repr__(self):
+        return (f"Task(id={self.id!r}, title={self.title!r}, description={self.description!r}, "
+                f"status={self.status!r}, priority={self.priority!r}, created_at={self.created_at!r}, "
+                f"due_date={self.due_date!r}, duration_seconds={self.duration_seconds!r}, "
+                f"remaining_seconds={self.remaining_seconds!r}, version={self.version!r}, "
+                f"sessions={self.sessions!r})")
+
+    def _astuple(self):
+        return (self.id, self.title, self.description, self.status, self.priority,
+                self.created_at, self.due_date, self.duration_seconds, self.remaining_seconds,
+                self.version, self.sessions)
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._astuple() == other._astuple()
+
+    __hash__ = None  # mutable, like the dataclass it replaces
+
+    def copy_from(self, other: "Task") -> None:
+        # take over another copy's fields in place (e.g. a newer version from disk)
+        for name in _FIELDS:
+            setattr(self, name, getattr(other, name))
+
+    @property
+    def created_dt(self) -> Optional[datetime]:
+        # parsed created_at, cached until created_at is reassigned
+        cache = self._created_cache
+        if cache is None or cache[0] is not self.created_at:
+            try:
+                parsed = datetime.fromisoformat(self.created_at)
+            except (TypeError, ValueError):
+                parsed = None
+            cache = self._created_cache = (self.created_at, parsed)
+        return cache[1]
 
     def to_dict(self):
-        return asdict(self)
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "status": self.status,
+            "priority": self.priority,
+            "created_at": self.created_at,
+            "due_date": self.due_date,
+            "duration_seconds": self.duration_seconds,
+            "remaining_seconds": self.remaining_seconds,
+            "version": self.version,
+            "sessions": self.sessions,
+        }
 
     @staticmethod
     def from_dict(d: dict):
         # Provide robust defaults if keys are missing
+        get = d.get
+        duration = get("duration_seconds", 0)
+        remaining = get("remaining_seconds", duration)
+        version = get("version", 0)
+        sessions = get("sessions")
         return Task(
-            id=int(d.get("id", 0)),
-            title=d.get("title", ""),
-            description=d.get("description", ""),
-            status=d.get("status", "pending"),
-            priority=d.get("priority", "low"),
-            created_at=d.get("created_at"),
-            due_date=d.get("due_date"),
-            duration_seconds=int(d.get("duration_seconds", 0)),
-            remaining_seconds=int(d.get("remaining_seconds", d.get("duration_seconds", 0))),
+            int(get("id", 0)),
+            get("title", ""),
+            get("description", ""),
+            get("status", "pending"),
+            get("priority", "low"),
+            get("created_at"),
+            get("due_date"),
+            duration if duration.__class__ is int else int(duration),
+            remaining if remaining.__class__ is int else int(remaining),
+            version if version.__class__ is int else int(version),
+            tuple(map(tuple, sessions)) if sessions else (),
         )
+
+_FIELDS = tuple(name for name in Task.__slots__ if not name.startswith("_"))
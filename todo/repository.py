@@ -0,0 +1,187 @@
+import bisect
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .models import Task
+from .due import DueIndex
+from .stats import TaskStats
+
+class TaskRepository:
+    """In-memory owner of all tasks with O(1) id lookup.
+
+    Secondary indexes (status, priority, status+priority counts and a
+    created_at-sorted order) are maintained on every add/update/remove so
+    filtering never rescans the whole list. Tasks are mutated in place by
+    callers; call ``update(task)`` afterwards so the indexes follow.
+    ``stats`` holds the overview counters and ``due`` the due-date heap,
+    both kept current the same way.
+    """
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        self._by_id: Dict[int, Task] = {}
+        self._by_status: Dict[str, Dict[int, Task]] = {}
+        self._by_priority: Dict[str, Dict[int, Task]] = {}
+        self._pair_counts: Dict[Tuple[str, str], int] = {}
+        self._keys: Dict[int, Tuple[str, str, str]] = {}  # id -> indexed (status, priority, created_at)
+        self._order: List[Tuple[str, int]] = []            # sorted (created_at, id)
+        self._next_id = 1
+        self.stats = TaskStats()
+        self.due = DueIndex()
+        self.add_many(tasks)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self._by_id.values())
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._by_id
+
+    def get(self, task_id: int) -> Optional[Task]:
+        return self._by_id.get(task_id)
+
+    def all(self) -> List[Task]:
+        return list(self._by_id.values())
+
+    def next_id(self) -> int:
+        # ids are monotonic: deleting the newest task never hands its id out again
+        return self._next_id
+
+    def allocate_id(self) -> int:
+        new_id = self._next_id
+        self._next_id += 1
+        return new_id
+
+    # ---------- mutations ----------
+    def add(self, task: Task) -> Task:
+        if task.id in self._by_id:
+            raise ValueError(f"Task {task.id} already exists")
+        self._index(task)
+        return task
+
+    def add_many(self, tasks: Iterable[Task]) -> None:
+        # bulk insert: one sort of the created_at order instead of an insort
+        # per task; a repeated id replaces the earlier task
+        new = []
+        for task in {t.id: t for t in tasks}.values():
+            if task.id in self._by_id:
+                self.update(task)
+            else:
+                new.append(task)
+        for task in new:
+            self._index(task, sort=False)
+        if new:
+            self._order.sort()
+
+    def update(self, task: Task) -> Task:
+        # insert or replace, then re-index from the task's current fields;
+        # an existing task keeps its position in iteration order
+        old = self._keys.get(task.id)
+        if old is None:
+            self._index(task)
+            return task
+        key = (task.status, task.priority, task.created_at or "")
+        if key != old or self._by_id[task.id] is not task:
+            self._unlink(task.id, old)
+            self._by_id[task.id] = task
+            self._link(task, key)
+        self.stats.update(task)
+        self.due.update(task)
+        return task
+
+    def remove(self, task_id: int) -> Optional[Task]:
+        if task_id not in self._by_id:
+            return None
+        return self._unindex(task_id)
+
+    def _index(self, task: Task, sort: bool = True) -> None:
+        self._by_id[task.id] = task
+        self._link(task, (task.status, task.priority, task.created_at or ""), sort)
+        if task.id >= self._next_id:
+            self._next_id = task.id + 1
+        self.stats.add(task)
+        self.due.add(task)
+
+    def _unindex(self, task_id: int) -> Task:
+        self._unlink(task_id, self._keys[task_id])
+        self.stats.remove(task_id)
+        self.due.remove(task_id)
+        return self._by_id.pop(task_id)
+
+    def _link(self, task: Task, key: Tuple[str, str, str], sort: bool = True) -> None:
+        self._keys[task.id] = key
+        self._by_status.setdefault(key[0], {})[task.id] = task
+        self._by_priority.setdefault(key[1], {})[task.id] = task
+        self._pair_counts[key[:2]] = self._pair_counts.get(key[:2], 0) + 1
+        entry = (key[2], task.id)
+        if sort:
+            bisect.insort(self._order, entry)
+        else:
+            self._order.append(entry)
+
+    def _unlink(self, task_id: int, key: Tuple[str, str, str]) -> None:
+        status, priority, created_at = key
+        del self._keys[task_id]
+        del self._by_status[status][task_id]
+        del self._by_priority[priority][task_id]
+        self._pair_counts[(status, priority)] -= 1
+        i = bisect.bisect_left(self._order, (created_at, task_id))
+        del self._order[i]
+
+    # ---------- queries ----------
+    def count(self, status: str = "all", priority: str = "all") -> int:
+        if status == "all" and priority == "all":
+            return len(self._by_id)
+        if priority == "all":
+            return len(self._by_status.get(status, ()))
+        if status == "all":
+            return len(self._by_priority.get(priority, ()))
+        return self._pair_counts.get((status, priority), 0)
+
+    def query(self, status: str = "all", priority: str = "all", newest: bool = True,
+              ids: Optional[Iterable[int]] = None, due: str = "all",
+              by_due: bool = False) -> List[Task]:
+        """Tasks matching the filters, ordered by created_at (or due date).
+
+        ``ids`` restricts the result to a candidate set (e.g. search hits);
+        ``due`` to pending tasks in one due bucket ("overdue", "today",
+        "week", "later"). ``by_due`` puts the soonest due first and tasks
+        without a due date last.
+        """
+        if due != "all":
+            due_ids = self.due.ids_in(due, date.today())
+            ids = due_ids if ids is None else set(ids).intersection(due_ids)
+        tasks = self._query(status, priority, newest, ids)
+        if by_due:
+            rank = self.due.rank()
+            tasks.sort(key=lambda t: rank.get(t.id, len(rank)))
+        return tasks
+
+    def _query(self, status: str, priority: str, newest: bool,
+               ids: Optional[Iterable[int]]) -> List[Task]:
+        if ids is not None:
+            bucket = {}
+            for tid in ids:
+                task = self._by_id.get(tid)
+                if task is None:
+                    continue
+                if status != "all" and task.status != status:
+                    continue
+                if priority != "all" and task.priority != priority:
+                    continue
+                bucket[tid] = task
+        elif status == "all" and priority == "all":
+            order = reversed(self._order) if newest else self._order
+            return [self._by_id[tid] for _, tid in order]
+        elif priority == "all":
+            bucket = self._by_status.get(status, {})
+        elif status == "all":
+            bucket = self._by_priority.get(priority, {})
+        else:
+            by_status = self._by_status.get(status, {})
+            by_prio = self._by_priority.get(priority, {})
+            small, large = sorted((by_status, by_prio), key=len)
+            bucket = {tid: t for tid, t in small.items() if tid in large}
+        keys = self._keys
+        ordered = sorted(bucket, key=lambda tid: (keys[tid][2], tid), reverse=newest)
+        return [bucket[tid] for tid in ordered]
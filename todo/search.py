@@ -0,0 +1,141 @@
+import bisect
+import re
+from typing import Dict, Iterable, List, Set
+from .models import Task
+
+_TOKEN_RE = re.compile(r"\w+")
+_SEP = "\x00"  # joins title and description; never part of a query
+
+def _searchable_text(task: Task) -> str:
+    return f"{task.title}{_SEP}{task.description or ''}".lower()
+
+def _trigrams(token: str) -> Set[str]:
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+class SearchIndex:
+    """Incremental token index over task title + description.
+
+    Each task contributes only its distinct words (``token -> task ids``);
+    substring lookups go through a trigram index over the vocabulary, which
+    grows far slower than the task list because words repeat. ``search``
+    answers case-insensitive substring queries (the semantics the search
+    box has always had): every word-character run of the query must occur
+    inside some indexed word, and the few surviving candidates are verified
+    against the full text. ``search_prefix`` matches word prefixes.
+    """
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        self._text: Dict[int, str] = {}
+        self._token_ids: Dict[str, Set[int]] = {}
+        self._gram_tokens: Dict[str, Set[str]] = {}  # trigram -> vocabulary words containing it
+        self._sorted_tokens: List[str] = []          # rebuilt lazily for prefix lookups
+        self._sorted_dirty = False
+        for task in tasks:
+            self.add(task)
+
+    def __len__(self) -> int:
+        return len(self._text)
+
+    def add(self, task: Task) -> None:
+        if task.id in self._text:
+            self.update(task)
+            return
+        text = _searchable_text(task)
+        self._text[task.id] = text
+        self._link(task.id, set(_TOKEN_RE.findall(text)))
+
+    def update(self, task: Task) -> None:
+        old = self._text.get(task.id)
+        if old is None:
+            self.add(task)
+            return
+        text = _searchable_text(task)
+        if text == old:
+            return  # status/priority/timer changes don't touch the index
+        self._text[task.id] = text
+        old_tokens, new_tokens = set(_TOKEN_RE.findall(old)), set(_TOKEN_RE.findall(text))
+        self._unlink(task.id, old_tokens - new_tokens)
+        self._link(task.id, new_tokens - old_tokens)
+
+    def remove(self, task_id: int) -> None:
+        text = self._text.pop(task_id, None)
+        if text is not None:
+            self._unlink(task_id, set(_TOKEN_RE.findall(text)))
+
+    def _link(self, task_id: int, tokens: Set[str]) -> None:
+        for token in tokens:
+            ids = self._token_ids.get(token)
+            if ids is None:
+                ids = self._token_ids[token] = set()
+                for gram in _trigrams(token):
+                    self._gram_tokens.setdefault(gram, set()).add(token)
+                self._sorted_dirty = True
+            ids.add(task_id)
+
+    def _unlink(self, task_id: int, tokens: Set[str]) -> None:
+        for token in tokens:
+            ids = self._token_ids.get(token)
+            if ids is None:
+                continue
+            ids.discard(task_id)
+            if not ids:
+                del self._token_ids[token]
+                for gram in _trigrams(token):
+                    words = self._gram_tokens[gram]
+                    words.discard(token)
+                    if not words:
+                        del self._gram_tokens[gram]
+                self._sorted_dirty = True
+
+    def _tokens_containing(self, word: str) -> Iterable[str]:
+        if len(word) < 3:
+            # short fragments are unselective; scan the (small) vocabulary
+            return [token for token in self._token_ids if word in token]
+        lists = []
+        for gram in _trigrams(word):
+            tokens = self._gram_tokens.get(gram)
+            if not tokens:
+                return []
+            lists.append(tokens)
+        lists.sort(key=len)
+        candidates = set(lists[0])
+        for tokens in lists[1:]:
+            candidates &= tokens
+        return [token for token in candidates if word in token]
+
+    def search(self, query: str) -> Set[int]:
+        """Ids of tasks whose title or description contains ``query``."""
+        q = query.strip().lower()
+        if not q:
+            return set(self._text)
+        words = _TOKEN_RE.findall(q)
+        if not words:
+            # punctuation-only query: nothing indexable, scan the texts
+            return {tid for tid, text in self._text.items() if q in text}
+        candidates = None
+        for word in sorted(set(words), key=len, reverse=True):
+            ids: Set[int] = set()
+            for token in self._tokens_containing(word):
+                ids |= self._token_ids[token]
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return set()
+        if words == [q]:
+            return candidates  # a single word found inside an indexed word is a hit
+        return {tid for tid in candidates if q in self._text[tid]}
+
+    def search_prefix(self, prefix: str) -> Set[int]:
+        """Ids of tasks containing a word that starts with ``prefix``."""
+        p = prefix.strip().lower()
+        result: Set[int] = set()
+        if not p:
+            return result
+        if self._sorted_dirty:
+            self._sorted_tokens = sorted(self._token_ids)
+            self._sorted_dirty = False
+        tokens = self._sorted_tokens
+        i = bisect.bisect_left(tokens, p)
+        while i < len(tokens) and tokens[i].startswith(p):
+            result |= self._token_ids[tokens[i]]
+            i += 1
+        return result
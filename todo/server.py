@@ -0,0 +1,363 @@
+"""Headless HTTP/JSON API: ``python -m todo serve``.
+
+Stdlib only: ``asyncio.start_server`` plus a minimal HTTP/1.1 reader. All
+requests are handled on the event loop thread against one shared
+in-memory store (repository, search index, timers), so concurrent clients
+never race each other; changes reach disk through the same coalescing
+``BackgroundWriter`` the GUI uses.
+
+    GET    /tasks?status=&priority=&due=&search=&sort=newest|oldest|due&limit=&offset=
+    POST   /tasks                      {"title": ..., "priority": ..., ...}
+    GET    /tasks/<id>
+    PATCH  /tasks/<id>                 changed fields only (PUT is accepted too)
+    DELETE /tasks/<id>
+    POST   /tasks/<id>/timer/start
+    POST   /tasks/<id>/timer/stop
+
+Reads carry an ETag; send it back as If-None-Match to get a bodiless 304
+while nothing changed.
+"""
+import asyncio
+import json
+import logging
+import re
+import uuid
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from . import storage
+from .metrics import timed
+from .models import Task
+from .repository import TaskRepository
+from .search import SearchIndex
+from .timers import TimerScheduler
+from .tracking import record_session
+from .utils import normalize_due_date
+from .watcher import StoreWatcher
+
+DEFAULT_PORT = 8765
+PERSIST_WINDOW_S = 0.5     # background writer coalescing window
+WATCH_INTERVAL_S = 1.0     # how often the store is checked for external edits
+MAX_BODY = 1024 * 1024
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+STATUSES = ("pending", "done")
+PRIORITIES = ("high", "medium", "low")
+DUE_FILTERS = ("all", "overdue", "today", "week", "later")
+EDITABLE = ("title", "description", "status", "priority", "due_date")
+
+_TASK_PATH = re.compile(r"^/tasks/(\d+)(/timer/(start|stop))?$")
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+Response = Tuple[int, Dict[str, str], Optional[dict]]
+
+class TodoService:
+    """The task store shared by every client of one server."""
+
+    def __init__(self, path: str, window: float = PERSIST_WINDOW_S):
+        self.path = path
+        self.backend = storage.get_backend(path)
+        self.sync = self.backend.StoreSync(path)
+        self.sync.mark()
+        tasks = self.backend.load_tasks(path)
+        self.repo = TaskRepository(tasks)
+        self.search_index = SearchIndex(tasks)
+        self.timers = TimerScheduler()
+        self.writer = storage.BackgroundWriter(path, self.backend, window=window, sync=self.sync)
+        self.watcher = StoreWatcher(path, self.backend, self.sync)
+        # ETags are "<boot>-<generation>": any change bumps the generation,
+        # and a restarted server never reuses an old tag
+        self._boot = uuid.uuid4().hex[:8]
+        self.generation = 0
+
+    @property
+    def etag(self) -> str:
+        return f'"{self._boot}-{self.generation}"'
+
+    # ---------- mutations ----------
+    def _persist(self, task: Task) -> None:
+        if task.id in self.timers:
+            task.remaining_seconds = self.timers.elapsed(task.id)
+        self.repo.update(task)
+        self.search_index.update(task)
+        self.writer.put(task)
+        self.generation += 1
+
+    def poll_store(self) -> int:
+        # apply edits made by other processes (the GUI, the CLI, scripts)
+        changes = self.watcher.changes(self.repo)
+        applied = 0
+        for task_id, fresh in changes.items():
+            if fresh is not None and self.writer.is_pending(task_id):
+                continue  # the writer merges it; a remote delete wins
+            applied += 1
+            if fresh is None:
+                self.timers.stop(task_id)
+                self.repo.remove(task_id)
+                self.search_index.remove(task_id)
+                continue
+            task = self.repo.get(task_id)
+            if task is None:
+                task = self.repo.add(fresh)
+            else:
+                task.copy_from(fresh)
+                self.repo.update(task)
+            self.search_index.update(task)
+            if task.status == "done" and task_id in self.timers:
+                self._stop(task)  # keep the time tracked here as a session
+                self._persist(task)
+        if applied:
+            self.generation += 1
+        return applied
+
+    def close(self) -> None:
+        for task_id in self.timers.running_ids():
+            task = self.repo.get(task_id)
+            self._stop(task)
+            self.writer.put(task)
+        self.writer.close()
+
+    # ---------- request handling ----------
+    @timed("api.handle")
+    def handle(self, method: str, target: str, headers: Dict[str, str], body: bytes) -> Response:
+        """(status, extra headers, JSON payload or None) for one request."""
+        try:
+            return self._route(method, target, headers, body)
+        except ApiError as e:
+            return e.status, {}, {"error": str(e)}
+
+    def _route(self, method, target, headers, body) -> Response:
+        url = urlsplit(target)
+        if url.path == "/tasks":
+            if method == "GET":
+                return self._cached(headers, lambda: self._list(parse_qs(url.query)))
+            if method == "POST":
+                return self._create(_json_body(body))
+            raise ApiError(405, f"{method} not allowed on /tasks")
+        m = _TASK_PATH.match(url.path)
+        if m is None:
+            raise ApiError(404, f"no route for {url.path}")
+        task = self.repo.get(int(m.group(1)))
+        if task is None:
+            raise ApiError(404, f"task {m.group(1)} not found")
+        action = m.group(3)
+        if action is not None:
+            if method != "POST":
+                raise ApiError(405, "timer actions need POST")
+            return self._timer(task, action)
+        if method == "GET":
+            return self._cached(headers, lambda: self._task_json(task))
+        if method in ("PATCH", "PUT"):
+            return self._update(task, _json_body(body))
+        if method == "DELETE":
+            self.timers.stop(task.id)
+            self.repo.remove(task.id)
+            self.search_index.remove(task.id)
+            self.writer.delete(task.id)
+            self.generation += 1
+            return 204, {}, None
+        raise ApiError(405, f"{method} not allowed on a task")
+
+    def _cached(self, headers, build) -> Response:
+        etag = self.etag
+        sent = headers.get("if-none-match", "")
+        tags = {tag.strip()[2:] if tag.strip().startswith("W/") else tag.strip()
+                for tag in sent.split(",")}
+        if etag in tags or "*" in tags:
+            return 304, {"ETag": etag}, None
+        return 200, {"ETag": etag}, build()
+
+    def _task_json(self, task: Task) -> dict:
+        d = task.to_dict()
+        # running timers are reported by state, not by a ticking value, so
+        # a running timer doesn't invalidate every cached response
+        d["running"] = task.id in self.timers
+        return d
+
+    def _list(self, query: Dict[str, list]) -> dict:
+        def arg(name, default, allowed=None):
+            value = query.get(name, [default])[-1]
+            if allowed is not None and value not in allowed:
+                raise ApiError(400, f"{name} must be one of {', '.join(allowed)}")
+            return value
+
+        status = arg("status", "all", ("all",) + STATUSES)
+        priority = arg("priority", "all", ("all",) + PRIORITIES)
+        due = arg("due", "all", DUE_FILTERS)
+        sort = arg("sort", "newest", ("newest", "oldest", "due"))
+        search = arg("search", "").strip().lower()
+        try:
+            limit = min(int(arg("limit", DEFAULT_LIMIT)), MAX_LIMIT)
+            offset = max(int(arg("offset", 0)), 0)
+        except ValueError:
+            raise ApiError(400, "limit and offset must be integers")
+        ids = self.search_index.search(search) if search else None
+        tasks = self.repo.query(status, priority, newest=sort != "oldest", ids=ids,
+                                due=due, by_due=sort == "due")
+        page = tasks[offset:offset + limit] if limit >= 0 else tasks[offset:]
+        return {"total": len(tasks), "offset": offset, "limit": limit,
+                "tasks": [self._task_json(t) for t in page]}
+
+    def _create(self, data: dict) -> Response:
+        fields = _validate(data, partial=False)
+        task_id = self.backend.allocate_ids(self.path, 1, self.repo.next_id())
+        task = Task(id=task_id, created_at=datetime.now().isoformat(), **fields)
+        self.repo.add(task)
+        self.search_index.add(task)
+        self._persist(task)
+        return 201, {"Location": f"/tasks/{task.id}"}, self._task_json(task)
+
+    def _update(self, task: Task, data: dict) -> Response:
+        fields = _validate(data, partial=True)
+        if fields.get("status") == "done":
+            self._stop(task)
+        for name, value in fields.items():
+            setattr(task, name, value)
+        self._persist(task)
+        return 200, {}, self._task_json(task)
+
+    def _stop(self, task: Task) -> None:
+        if task.id in self.timers:
+            record_session(task, self.timers.running_for(task.id))
+            task.remaining_seconds = self.timers.stop(task.id)
+
+    def _timer(self, task: Task, action: str) -> Response:
+        if action == "start":
+            if task.status == "done":
+                raise ApiError(409, "task is done")
+            self.timers.start(task.id, task.remaining_seconds)
+            self.generation += 1
+        else:
+            self._stop(task)
+            self._persist(task)
+        d = self._task_json(task)
+        d["elapsed_seconds"] = self.timers.elapsed(task.id, task.remaining_seconds)
+        return 200, {}, d
+
+def _json_body(body: bytes) -> dict:
+    try:
+        data = json.loads(body or b"{}")
+    except ValueError:
+        raise ApiError(400, "body must be JSON")
+    if not isinstance(data, dict):
+        raise ApiError(400, "body must be a JSON object")
+    return data
+
+def _validate(data: dict, partial: bool) -> dict:
+    unknown = set(data) - set(EDITABLE)
+    if unknown:
+        raise ApiError(400, f"unknown or read-only fields: {', '.join(sorted(unknown))}")
+    fields = dict(data)
+    if not partial and not str(fields.get("title") or "").strip():
+        raise ApiError(400, "title is required")
+    if "title" in fields and not isinstance(fields["title"], str):
+        raise ApiError(400, "title must be a string")
+    if "title" in fields and not fields["title"].strip():
+        raise ApiError(400, "title must not be empty")
+    if "status" in fields and fields["status"] not in STATUSES:
+        raise ApiError(400, f"status must be one of {', '.join(STATUSES)}")
+    if "priority" in fields and fields["priority"] not in PRIORITIES:
+        raise ApiError(400, f"priority must be one of {', '.join(PRIORITIES)}")
+    if "due_date" in fields:
+        try:
+            fields["due_date"] = normalize_due_date(fields["due_date"])
+        except ValueError as e:
+            raise ApiError(400, str(e))
+    if "description" in fields:
+        if fields["description"] is not None and not isinstance(fields["description"], str):
+            raise ApiError(400, "description must be a string")
+        fields["description"] = fields["description"] or ""
+    return fields
+
+# ---------- HTTP ----------
+_REASONS = {200: "OK", 201: "Created", 204: "No Content", 304: "Not Modified",
+            400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            409: "Conflict", 413: "Payload Too Large"}
+
+async def _read_request(reader: asyncio.StreamReader):
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise ApiError(400, "malformed request line")
+    headers: Dict[str, str] = {}
+    while True:
+        raw = await reader.readline()
+        if raw in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = raw.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise ApiError(400, "invalid Content-Length")
+    if length > MAX_BODY:
+        raise ApiError(413, "request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, version, headers, body
+
+def _encode(status: int, extra: Dict[str, str], payload, keep_alive: bool) -> bytes:
+    body = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+             f"Content-Length: {len(body)}",
+             f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    if body:
+        lines.append("Content-Type: application/json; charset=utf-8")
+    lines.extend(f"{name}: {value}" for name, value in extra.items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+async def _handle_connection(service: TodoService, reader, writer) -> None:
+    try:
+        while True:
+            try:
+                request = await _read_request(reader)
+            except ApiError as e:
+                writer.write(_encode(e.status, {}, {"error": str(e)}, False))
+                await writer.drain()
+                break
+            if request is None:
+                break
+            method, target, version, headers, body = request
+            keep_alive = (headers.get("connection", "").lower() != "close"
+                          and version != "HTTP/1.0")
+            status, extra, payload = service.handle(method, target, headers, body)
+            writer.write(_encode(status, extra, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+async def _watch(service: TodoService) -> None:
+    while True:
+        await asyncio.sleep(WATCH_INTERVAL_S)
+        try:
+            service.poll_store()
+        except Exception:
+            logging.exception("Checking the store for external changes failed")
+
+async def serve(path: str, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                ready=None) -> None:
+    """Run the API until cancelled; ``ready(server)`` is called once listening."""
+    service = TodoService(path)
+    server = await asyncio.start_server(lambda r, w: _handle_connection(service, r, w), host, port)
+    watcher = asyncio.ensure_future(_watch(service))
+    try:
+        if ready is not None:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+    finally:
+        watcher.cancel()
+        service.close()
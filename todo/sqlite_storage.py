@@ -0,0 +1,315 @@
+"""SQLite task storage with the same operations as ``todo.storage``.
+
+Selected by giving ``TASKS_PATH`` a ``.db``/``.sqlite``/``.sqlite3`` suffix
+(see ``todo.storage.get_backend``). Rows are upserted and deleted one at a
+time, and ``query_tasks`` pages through filtered results without loading
+the whole table. Several processes can share a database: writes run in
+``BEGIN IMMEDIATE`` transactions and concurrent edits are merged by version.
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+from .metrics import timed
+from .models import Task
+from .storage import merge_records
+
+# column order matches Task's constructor so rows map straight onto it
+COLUMNS = (
+    ("id", "INTEGER PRIMARY KEY"),
+    ("title", "TEXT NOT NULL DEFAULT ''"),
+    ("description", "TEXT NOT NULL DEFAULT ''"),
+    ("status", "TEXT NOT NULL DEFAULT 'pending'"),
+    ("priority", "TEXT NOT NULL DEFAULT 'low'"),
+    ("created_at", "TEXT"),
+    ("due_date", "TEXT"),
+    ("duration_seconds", "INTEGER NOT NULL DEFAULT 0"),
+    ("remaining_seconds", "INTEGER NOT NULL DEFAULT 0"),
+    ("version", "INTEGER NOT NULL DEFAULT 0"),
+    ("sessions", "TEXT NOT NULL DEFAULT '[]'"),  # JSON list of [start, end]
+)
+_NAMES = tuple(name for name, _ in COLUMNS)
+_VERSION = _NAMES.index("version")
+_SELECT = f"SELECT {', '.join(_NAMES)} FROM tasks"
+_UPSERT = (f"INSERT OR REPLACE INTO tasks ({', '.join(_NAMES)}) "
+           f"VALUES ({', '.join('?' for _ in _NAMES)})")
+_INDEXED = ("status", "priority", "created_at", "due_date")
+
+_local = threading.local()  # one connection per (thread, path)
+
+def _connect(path: str) -> sqlite3.Connection:
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _ensure_schema(conn)
+        conns[path] = conn
+    return conn
+
+def close(path: str) -> None:
+    conns = getattr(_local, "conns", {})
+    conn = conns.pop(path, None)
+    if conn is not None:
+        conn.close()
+
+def _ensure_schema(conn: sqlite3.Connection) -> None:
+    cols = ", ".join(f"{name} {decl}" for name, decl in COLUMNS)
+    with conn:
+        conn.execute(f"CREATE TABLE IF NOT EXISTS tasks ({cols})")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)")
+        # databases created by older versions get any new Task fields added
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(tasks)")}
+        for name, decl in COLUMNS:
+            if name not in existing:
+                conn.execute(f"ALTER TABLE tasks ADD COLUMN {name} {decl}")
+        for col in _INDEXED:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_tasks_{col} ON tasks ({col})")
+
+def _row(task: Task) -> tuple:
+    return _encode(task.to_dict())
+
+def _encode(d: dict) -> tuple:
+    sessions = d.get("sessions")
+    return tuple(json.dumps(sessions or []) if name == "sessions" else d.get(name)
+                 for name in _NAMES)
+
+def _record(row) -> dict:
+    d = dict(zip(_NAMES, row))
+    d["sessions"] = json.loads(d["sessions"] or "[]")
+    return d
+
+def _task(row) -> Task:
+    # every column but the JSON sessions maps straight onto Task's constructor
+    *fields, sessions = row
+    if sessions and sessions != "[]":
+        return Task(*fields, tuple(map(tuple, json.loads(sessions))))
+    return Task(*fields)
+
+@timed("sqlite.load_tasks")
+def load_tasks(path: str) -> List[Task]:
+    conn = _connect(path)
+    return [_task(row) for row in conn.execute(_SELECT + " ORDER BY id")]
+
+def iter_task_batches(path: str, batch_size: int = 500) -> Iterator[List[Task]]:
+    cursor = _connect(path).execute(_SELECT + " ORDER BY id")
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield [_task(row) for row in rows]
+
+@timed("sqlite.save_tasks")
+def save_tasks(path: str, tasks: Iterable[Task]) -> None:
+    # replace the whole table in one transaction
+    conn = _connect(path)
+    with conn:
+        conn.execute("DELETE FROM tasks")
+        conn.executemany(_UPSERT, (_row(t) for t in tasks))
+
+def get_next_id(path: str) -> int:
+    (max_id,) = _connect(path).execute("SELECT MAX(id) FROM tasks").fetchone()
+    return 1 if max_id is None else int(max_id) + 1
+
+def allocate_ids(path: str, count: int = 1, floor: int = 1) -> int:
+    # same contract as storage.allocate_ids, with the counter in the meta table
+    conn = _connect(path)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'next_id'").fetchone()
+        (max_id,) = conn.execute("SELECT MAX(id) FROM tasks").fetchone()
+        first = max(row[0] if row else 1, floor, (max_id or 0) + 1)
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('next_id', ?)",
+                     (first + count,))
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return first
+
+@timed("sqlite.put_task")
+def put_task(path: str, task: Task) -> None:
+    task.version = apply_changes(path, [task.to_dict()])[task.id]
+
+@timed("sqlite.delete_task")
+def delete_task(path: str, task_id: int) -> None:
+    apply_changes(path, deletes=[task_id])
+
+@timed("sqlite.apply_changes")
+def apply_changes(path: str, puts: Iterable[dict] = (), deletes: Iterable[int] = (),
+                  sync: Optional["StoreSync"] = None) -> Dict[int, int]:
+    """Upsert task dicts and delete ids in one transaction.
+
+    Same contract as ``storage.apply_changes``: a put whose row has a newer
+    version than the one it was edited from is merged with that row, and
+    the versions written are returned by id.
+    """
+    if sync is None:
+        return _apply_changes(path, puts, deletes, None)
+    with sync.io_lock:  # a poll on another thread must not see our commit half-recorded
+        return _apply_changes(path, puts, deletes, sync)
+
+def _apply_changes(path, puts, deletes, sync) -> Dict[int, int]:
+    conn = _connect(path)
+    deletes = [int(tid) for tid in deletes]
+    written: Dict[int, int] = {}
+    merged: Dict[int, Optional[dict]] = {}
+    conn.execute("BEGIN IMMEDIATE")  # take the write lock before reading versions
+    try:
+        for d in puts:
+            task_id = int(d.get("id", 0))
+            base = int(d.get("version") or 0)
+            row = conn.execute(_SELECT + " WHERE id = ?", (task_id,)).fetchone()
+            if row is None and sync is not None and sync.deleted_elsewhere(task_id):
+                merged[task_id] = None  # deleted by another process: the delete wins
+                continue
+            disk = 0 if row is None else int(row[_VERSION] or 0)
+            if disk > base:
+                d = merge_records(d, _record(row))
+            d = dict(d, version=max(disk, base) + 1)
+            if disk > base:
+                merged[task_id] = d
+            conn.execute(_UPSERT, _encode(d))
+            written[task_id] = d["version"]
+        conn.executemany("DELETE FROM tasks WHERE id = ?", ((tid,) for tid in deletes))
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    if sync is not None:
+        sync.record_own(written, deletes, merged)
+    return written
+
+def maybe_compact(path: str, tasks: Optional[Iterable[Task]] = None, threshold: int = 0,
+                  sync: Optional["StoreSync"] = None) -> bool:
+    # rows are updated in place and SQLite checkpoints its own WAL
+    return False
+
+class StoreSync:
+    """``storage.StoreSync`` for a database shared with other processes.
+
+    ``poll`` is cheap while nothing was committed (``PRAGMA data_version``);
+    otherwise it compares ids and versions against what this process last
+    saw and fetches only the rows that differ.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.needs_reload = False  # never set: row diffs cover every change
+        self._lock = threading.Lock()
+        self.io_lock = threading.Lock()  # held by apply_changes and poll
+        self._data_version = None
+        self._versions: Dict[int, int] = {}
+        self._remote_deletes: Set[int] = set()  # ids other processes deleted
+        self._incoming: Dict[int, Optional[dict]] = {}
+
+    def mark(self) -> None:
+        conn = _connect(self.path)
+        (self._data_version,) = conn.execute("PRAGMA data_version").fetchone()
+        versions = dict(conn.execute("SELECT id, version FROM tasks"))
+        with self._lock:
+            self._versions = versions
+            self._remote_deletes.clear()
+            self._incoming.clear()
+
+    def poll(self) -> bool:
+        with self.io_lock:
+            return self._poll()
+
+    def _poll(self) -> bool:
+        conn = _connect(self.path)
+        (data_version,) = conn.execute("PRAGMA data_version").fetchone()
+        if data_version == self._data_version:
+            return False
+        self._data_version = data_version
+        current = dict(conn.execute("SELECT id, version FROM tasks"))
+        with self._lock:
+            changed = [tid for tid, v in current.items() if self._versions.get(tid) != v]
+            removed = [tid for tid in self._versions if tid not in current]
+            self._versions = current
+            self._remote_deletes.update(removed)
+        changes: Dict[int, Optional[dict]] = dict.fromkeys(removed)
+        for i in range(0, len(changed), 500):
+            chunk = changed[i:i + 500]
+            sql = f"{_SELECT} WHERE id IN ({', '.join('?' for _ in chunk)})"
+            for row in conn.execute(sql, chunk):
+                changes[row[0]] = _record(row)
+        with self._lock:
+            self._incoming.update(changes)
+        return bool(changes)
+
+    def record_own(self, written: Dict[int, int], deletes: Iterable[int],
+                   merged: Dict[int, Optional[dict]]) -> None:
+        # our own commits are not remote changes; merges still need applying
+        with self._lock:
+            self._versions.update(written)
+            self._remote_deletes.difference_update(written)
+            for tid in deletes:
+                self._versions.pop(tid, None)
+            for tid, record in merged.items():
+                if record is None:
+                    self._versions.pop(tid, None)
+                    self._remote_deletes.add(tid)
+                self._incoming[tid] = record
+
+    def deleted_elsewhere(self, task_id: int) -> bool:
+        # a missing row we last saw present (or saw vanish in a poll) was
+        # deleted by another process; rows we deleted ourselves, e.g. before
+        # an undo puts them back, are neither
+        with self._lock:
+            return task_id in self._versions or task_id in self._remote_deletes
+
+    def drain(self) -> Dict[int, Optional[dict]]:
+        with self._lock:
+            incoming, self._incoming = self._incoming, {}
+        return incoming
+
+def _where(status: str, priority: str, search: str):
+    clauses, params = [], []
+    if status != "all":
+        clauses.append("status = ?")
+        params.append(status)
+    if priority != "all":
+        clauses.append("priority = ?")
+        params.append(priority)
+    q = search.strip().lower()
+    if q:
+        clauses.append("(instr(lower(title), ?) > 0 OR instr(lower(description), ?) > 0)")
+        params.extend((q, q))
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+@timed("sqlite.query_tasks")
+def query_tasks(path: str, status: str = "all", priority: str = "all", search: str = "",
+                newest: bool = True, limit: Optional[int] = 50, offset: int = 0) -> List[Task]:
+    """One page of tasks matching the filters, ordered by created_at."""
+    where, params = _where(status, priority, search)
+    order = "DESC" if newest else "ASC"
+    sql = f"{_SELECT}{where} ORDER BY created_at {order}, id {order}"
+    if limit is not None:
+        sql += " LIMIT ? OFFSET ?"
+        params.extend((int(limit), int(offset)))
+    return [_task(row) for row in _connect(path).execute(sql, params)]
+
+def count_tasks(path: str, status: str = "all", priority: str = "all", search: str = "") -> int:
+    where, params = _where(status, priority, search)
+    (n,) = _connect(path).execute(f"SELECT COUNT(*) FROM tasks{where}", params).fetchone()
+    return n
+
+def migrate_from_json(json_path: str, db_path: str) -> int:
+    """Copy every task from a tasks.json store (journal included) into db_path."""
+    from . import storage
+    tasks = storage.load_tasks(json_path) if os.path.exists(json_path) else []
+    save_tasks(db_path, tasks)
+    return len(tasks)
+
+if __name__ == "__main__":
+    # python -m todo.sqlite_storage tasks.json tasks.db
+    if len(sys.argv) != 3:
+        sys.exit("usage: python -m todo.sqlite_storage SOURCE.json TARGET.db")
+    count = migrate_from_json(sys.argv[1], sys.argv[2])
+    print(json.dumps({"migrated": count, "database": sys.argv[2]}))
@@ -0,0 +1,77 @@
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, Optional, Tuple
+from .models import Task
+from .utils import due_bucket, parse_due_date
+
+DUE_BUCKETS = ("overdue", "today", "week", "later", "none")
+PRIORITIES = ("high", "medium", "low")
+
+class TaskStats:
+    """Overview counters maintained with per-task deltas.
+
+    Each task's last contribution (status, priority, due date, tracked
+    seconds) is remembered by id, so ``update`` subtracts the old one and
+    adds the new one: O(1) per mutation however many tasks there are. Due
+    buckets only count pending tasks and are relative to ``today``; moving
+    to a new day (``set_today``) re-buckets once.
+    """
+
+    def __init__(self, tasks: Iterable[Task] = (), today: Optional[date] = None):
+        self.today = today or date.today()
+        self.by_status: Counter = Counter()
+        self.by_priority: Counter = Counter()
+        self.pending_by_priority: Counter = Counter()
+        self.by_due: Counter = Counter()
+        self.tracked: Counter = Counter()  # priority -> tracked seconds
+        self._contrib: Dict[int, Tuple[str, str, Optional[date], int]] = {}
+        for task in tasks:
+            self.update(task)
+
+    def __len__(self) -> int:
+        return len(self._contrib)
+
+    def update(self, task: Task) -> None:
+        new = (task.status, task.priority, parse_due_date(task.due_date),
+               int(task.remaining_seconds or 0))
+        old = self._contrib.get(task.id)
+        if old == new:
+            return
+        if old is not None:
+            self._apply(old, -1)
+        self._contrib[task.id] = new
+        self._apply(new, 1)
+
+    add = update
+
+    def remove(self, task_id: int) -> None:
+        old = self._contrib.pop(task_id, None)
+        if old is not None:
+            self._apply(old, -1)
+
+    def _bucket(self, due: Optional[date]) -> str:
+        return due_bucket(due, self.today)
+
+    def _apply(self, contrib, sign: int) -> None:
+        status, priority, due, seconds = contrib
+        self.by_status[status] += sign
+        self.by_priority[priority] += sign
+        self.tracked[priority] += sign * seconds
+        if status != "done":
+            self.pending_by_priority[priority] += sign
+            self.by_due[self._bucket(due)] += sign
+
+    def set_today(self, today: date) -> None:
+        if today == self.today:
+            return
+        self.today = today
+        self.by_due = Counter(self._bucket(due) for status, _, due, _ in self._contrib.values()
+                              if status != "done")
+
+    @property
+    def overdue(self) -> int:
+        return self.by_due["overdue"]
+
+    def average_tracked(self, priority: str) -> float:
+        n = self.by_priority[priority]
+        return self.tracked[priority] / n if n else 0.0
@@ -1,34 +1,669 @@
+import contextlib
+import gzip
 import json
+import logging
 import os
 import shutil
-from typing import List
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional
+from .metrics import timed
 from .models import Task
 
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, stores are single-process there
+    fcntl = None
+
+# Mutations are appended to "<path>.journal" as one compact JSON record per
+# line; the snapshot at <path> is only rewritten when the journal is compacted.
+JOURNAL_SUFFIX = ".journal"
+COMPACT_THRESHOLD = 256 * 1024  # journal size in bytes that triggers compaction
+STREAM_CHUNK_SIZE = 64 * 1024   # bytes read at a time by iter_task_batches
+LOCK_SUFFIX = ".lock"           # advisory lock file shared by every process
+SEQ_SUFFIX = ".seq"             # next free task id, see allocate_ids
+ARCHIVE_SUFFIX = ".archive"     # directory of gzip JSON-lines partitions, one per month
+ARCHIVE_AFTER_DAYS = 30         # default age at which done tasks leave the hot store
+
+# store paths with these suffixes use the SQLite backend instead
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+def get_backend(path: str):
+    # both backends expose load_tasks/save_tasks/put_task/delete_task/
+    # apply_changes/maybe_compact/allocate_ids/StoreSync
+    if path.lower().endswith(SQLITE_SUFFIXES):
+        from . import sqlite_storage
+        return sqlite_storage
+    return sys.modules[__name__]
+
+def journal_path(path: str) -> str:
+    return path + JOURNAL_SUFFIX
+
+_held = threading.local()  # store paths whose lock this thread already holds
+
+@contextlib.contextmanager
+def locked(path: str):
+    """Exclusive advisory lock on ``path`` shared by every process using it.
+
+    Wraps each load-modify-save sequence (journal appends, compaction, id
+    allocation). Re-entrant within a thread so locked helpers can nest.
+    """
+    held = _held.__dict__.setdefault("paths", set())
+    if fcntl is None or path in held:
+        yield
+        return
+    with open(path + LOCK_SUFFIX, "a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        held.add(path)
+        try:
+            yield
+        finally:
+            held.discard(path)
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+def merge_records(local: dict, remote: dict) -> dict:
+    # a local edit raced with another process's edit of the same task: the
+    # local fields win, but tracked time is never thrown away
+    merged = dict(remote)
+    merged.update(local)
+    merged["remaining_seconds"] = max(int(local.get("remaining_seconds") or 0),
+                                      int(remote.get("remaining_seconds") or 0))
+    sessions = {tuple(s) for s in local.get("sessions") or ()}
+    sessions.update(tuple(s) for s in remote.get("sessions") or ())
+    merged["sessions"] = sorted(sessions)
+    return merged
+
+@timed("storage.load_tasks")
 def load_tasks(path: str) -> List[Task]:
+    with locked(path):
+        return _load_tasks(path)
+
+def _load_tasks(path: str) -> List[Task]:
     if not os.path.exists(path):
         # create an empty tasks file
         with open(path, "w", encoding="utf-8") as f:
             json.dump([], f)
-        return []
+        return _replay_journal(path, [])
     try:
         with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
     except json.JSONDecodeError:
-        # backup corrupt file and return empty list
+        # backup corrupt file and keep whatever the journal can recover
         bak = path + ".bak"
         shutil.copy(path, bak)
-        return []
+        return _replay_journal(path, [])
     tasks = [Task.from_dict(item) for item in data]
-    return tasks
+    return _replay_journal(path, tasks)
+
+def _replay_journal(path: str, tasks: List[Task]) -> List[Task]:
+    changes = _read_journal(path)
+    if not changes:
+        return tasks
+    by_id = {t.id: t for t in tasks}  # keeps snapshot order, updates in place
+    for task_id, record in changes.items():
+        if record is None:
+            by_id.pop(task_id, None)
+        else:
+            by_id[task_id] = Task.from_dict(record)
+    return list(by_id.values())
+
+def _read_journal(path: str) -> Dict[int, Optional[dict]]:
+    # net effect of the journal: task_id -> latest task dict, None = deleted
+    jpath = journal_path(path)
+    changes: Dict[int, Optional[dict]] = {}
+    if not os.path.exists(jpath):
+        return changes
+    good_end = 0
+    with open(jpath, "rb") as f:
+        lines = []
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break  # torn trailing write from a crash
+            good_end += len(raw)
+            lines.append(raw)
+    _parse_journal(lines, changes)
+    if good_end < os.path.getsize(jpath):
+        # drop the partial line so later appends start on a clean record
+        with open(jpath, "r+b") as f:
+            f.truncate(good_end)
+    return changes
+
+def _parse_journal(lines: Iterable[bytes], changes: Dict[int, Optional[dict]]) -> None:
+    for raw in lines:
+        try:
+            rec = json.loads(raw)
+        except ValueError:
+            continue
+        op = rec.get("op")
+        if op == "put":
+            record = rec["task"]
+            changes[int(record.get("id", 0))] = record
+        elif op == "del":
+            changes[int(rec["id"])] = None
+
+def _iter_json_array(f, chunk_size: Optional[int] = None) -> Iterator:
+    # yield the items of a top-level JSON array without reading it all at once
+    chunk_size = chunk_size or STREAM_CHUNK_SIZE
+    decode = json.JSONDecoder().raw_decode
+    buf, pos, eof, started = "", 0, False, False
+    while True:
+        # skip whitespace and item separators
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(buf):
+            if eof:
+                raise ValueError("unexpected end of tasks file")
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf, pos = chunk, 0
+            continue
+        if not started:
+            if buf[pos] != "[":
+                raise ValueError("expected '[' at start of tasks file")
+            started = True
+            pos += 1
+            continue
+        if buf[pos] == "]":
+            return
+        try:
+            item, end = decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # the item straddles the chunk boundary; read more and retry
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+        yield item
+        pos = end
+
+def iter_task_batches(path: str, batch_size: int = 500) -> Iterator[List[Task]]:
+    """Stream the store as lists of Tasks, replaying the journal on the fly.
 
-def save_tasks(path: str, tasks: List[Task]) -> None:
+    The snapshot is parsed incrementally, so the first batch is available
+    before the rest of a large file has been read. A corrupt snapshot is
+    backed up to ``.bak`` like ``load_tasks`` does and streaming stops there.
+    """
+    if not os.path.exists(path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([], f)
+    with locked(path):
+        changes = _read_journal(path)
+    batch: List[Task] = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for item in _iter_json_array(f):
+                task_id = int(item.get("id", 0))
+                if task_id in changes:
+                    item = changes.pop(task_id)
+                    if item is None:
+                        continue
+                batch.append(Task.from_dict(item))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+    except ValueError:
+        shutil.copy(path, path + ".bak")
+    # tasks created since the last compaction only exist in the journal
+    for record in changes.values():
+        if record is not None:
+            batch.append(Task.from_dict(record))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+def append_journal(path: str, records: Iterable[dict]) -> None:
+    data = "".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n"
+                   for r in records)
+    if not data:
+        return
+    with open(journal_path(path), "a", encoding="utf-8") as f:
+        f.write(data)
+
+def put_task(path: str, task: Task) -> None:
+    task.version = apply_changes(path, [task.to_dict()])[task.id]
+
+def delete_task(path: str, task_id: int) -> None:
+    apply_changes(path, deletes=[task_id])
+
+@timed("storage.apply_changes")
+def apply_changes(path: str, puts: Iterable[dict] = (), deletes: Iterable[int] = (),
+                  sync: Optional["StoreSync"] = None) -> Dict[int, int]:
+    """Append a batch of task dicts to upsert and ids to delete.
+
+    Each put carries the ``version`` it was edited from and is written with
+    the next one; the new versions are returned by id. With a ``sync``,
+    records other processes appended meanwhile are read first: a put whose
+    task changed elsewhere since is merged with that change (and the merged
+    record queued on ``sync`` for the caller), one whose task was deleted
+    elsewhere is dropped.
+    """
+    written: Dict[int, int] = {}
+    with locked(path):
+        current = None
+        if sync is not None:
+            sync._poll()
+            if sync.needs_reload:
+                # compacted elsewhere: the journal records we would have
+                # checked are folded into the snapshot, so check that instead
+                current = {t.id: t.to_dict() for t in _load_tasks(path)}
+        records = []
+        for d in puts:
+            task_id = int(d.get("id", 0))
+            base = int(d.get("version") or 0)
+            version, merged = base + 1, False
+            if sync is not None:
+                if current is not None:
+                    remote = current.get(task_id)
+                    found = remote is not None
+                else:
+                    found, remote = sync.remote_change(task_id)
+                    if found and remote is None:
+                        sync.queue(task_id, None)  # deleted by another process: the delete wins
+                        continue
+                if found and int(remote.get("version") or 0) > base:
+                    d = merge_records(d, remote)
+                    version, merged = int(remote.get("version") or 0) + 1, True
+            d = dict(d, version=version)
+            if merged:
+                sync.queue(task_id, d)
+            records.append({"op": "put", "task": d})
+            written[task_id] = version
+        records.extend({"op": "del", "id": int(tid)} for tid in deletes)
+        append_journal(path, records)
+        if sync is not None:
+            sync.mark_positions()  # our own records need no reconciling
+    return written
+
+@timed("storage.maybe_compact")
+def maybe_compact(path: str, tasks: Optional[Iterable[Task]] = None,
+                  threshold: int = COMPACT_THRESHOLD, sync: Optional["StoreSync"] = None) -> bool:
+    # fold the journal back into the snapshot once it grows past threshold;
+    # without an in-memory task list the store is replayed from disk, which
+    # is the only safe choice when other processes share the store
+    try:
+        size = os.path.getsize(journal_path(path))
+    except OSError:
+        return False
+    if size < threshold:
+        return False
+    with locked(path):
+        try:
+            size = os.path.getsize(journal_path(path))
+        except OSError:
+            return False  # another process compacted first
+        if size < threshold:
+            return False
+        if sync is not None:
+            sync._poll()  # pick up other writers' records before they fold away
+        save_tasks(path, _load_tasks(path) if tasks is None else tasks)
+        if sync is not None:
+            sync.mark_positions()
+    return True
+
+@timed("storage.save_tasks")
+def save_tasks(path: str, tasks: Iterable[Task]) -> None:
     tmp = path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump([t.to_dict() for t in tasks], f, ensure_ascii=False, indent=2)
-    # atomic replace on most OSes
-    os.replace(tmp, path)
+    with locked(path):
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump([t.to_dict() for t in tasks], f, ensure_ascii=False, indent=2)
+        # atomic replace on most OSes
+        os.replace(tmp, path)
+        # the snapshot now contains everything the journal recorded; replaying a
+        # stale journal over it is harmless if we crash before the unlink
+        try:
+            os.remove(journal_path(path))
+        except FileNotFoundError:
+            pass
+
+def allocate_ids(path: str, count: int = 1, floor: int = 1) -> int:
+    """Reserve ``count`` consecutive task ids and return the first.
+
+    The counter lives in ``<path>.seq`` and is advanced under the store lock,
+    so two processes never hand out the same id. ``floor`` is the caller's
+    own idea of the next free id (e.g. ``TaskRepository.next_id()``).
+    """
+    seq = path + SEQ_SUFFIX
+    with locked(path):
+        try:
+            with open(seq, "r", encoding="utf-8") as f:
+                current = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            current = 0
+        first = max(current, floor)
+        with open(seq + ".tmp", "w", encoding="utf-8") as f:
+            f.write(str(first + count))
+        os.replace(seq + ".tmp", seq)
+    return first
 
 def get_next_id(tasks: List[Task]) -> int:
+    # only unique within one process; use allocate_ids when the store is shared
     if not tasks:
         return 1
     return max(int(t.id) for t in tasks) + 1
+
+# ---------- archive tier ----------
+def archive_dir(path: str) -> str:
+    return path + ARCHIVE_SUFFIX
+
+def _partition_path(path: str, task: Task) -> str:
+    created = task.created_dt
+    name = created.strftime("%Y-%m") if created else "undated"
+    return os.path.join(archive_dir(path), name + ".jsonl.gz")
+
+def _created_before(task: Task, cutoff: datetime) -> bool:
+    created = task.created_dt
+    if created is None:
+        return False
+    if created.tzinfo is not None:
+        # offsets from imported data are compared in local time, like the rest
+        created = created.astimezone().replace(tzinfo=None)
+    return created < cutoff
+
+def archive_done_tasks(path: str, max_age_days: int = ARCHIVE_AFTER_DAYS,
+                       now: Optional[datetime] = None) -> int:
+    """Move done tasks created more than ``max_age_days`` ago to the archive.
+
+    Works for either backend: the tasks are appended to gzip JSON-lines
+    partitions in ``<path>.archive/`` (by creation month), then deleted from
+    the hot store, which is compacted so it stops carrying them. Returns
+    the number of tasks moved.
+    """
+    backend = get_backend(path)
+    cutoff = (now or datetime.now()) - timedelta(days=max_age_days)
+    with locked(path):
+        tasks = backend.load_tasks(path)
+        old = [t for t in tasks if t.status == "done" and _created_before(t, cutoff)]
+        if not old:
+            return 0
+        by_partition: Dict[str, List[Task]] = {}
+        for task in old:
+            by_partition.setdefault(_partition_path(path, task), []).append(task)
+        os.makedirs(archive_dir(path), exist_ok=True)
+        for part, moved in by_partition.items():
+            # gzip members can simply be appended; readers see one stream.
+            # A crash before the deletes below only leaves duplicates, and
+            # the hot copy of a task always wins over the archived one.
+            with gzip.open(part, "at", encoding="utf-8") as f:
+                f.writelines(json.dumps(t.to_dict(), ensure_ascii=False, separators=(",", ":")) + "\n"
+                             for t in moved)
+        backend.apply_changes(path, deletes=[t.id for t in old])
+        backend.maybe_compact(path, threshold=0)
+        # archived ids stay taken even though the hot store no longer has them
+        backend.allocate_ids(path, 0, get_next_id(tasks))
+    return len(old)
+
+def _read_partition(part: str) -> Iterator[dict]:
+    try:
+        with gzip.open(part, "rt", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+    except (OSError, EOFError):
+        # a member torn by a crash mid-append: keep what came before it
+        logging.warning(f"Archive partition {part} is truncated")
+
+def load_archived_tasks(path: str, exclude: Iterable[int] = ()) -> List[Task]:
+    """Every archived task, oldest partition first; ids in ``exclude`` (e.g.
+    tasks that are back in the hot store) are skipped."""
+    adir = archive_dir(path)
+    if not os.path.isdir(adir):
+        return []
+    skip = set(exclude)
+    by_id: Dict[int, Task] = {}
+    for name in sorted(os.listdir(adir)):
+        if not name.endswith(".jsonl.gz"):
+            continue
+        for record in _read_partition(os.path.join(adir, name)):
+            task = Task.from_dict(record)
+            if task.id not in skip:
+                by_id[task.id] = task  # a task archived twice: the later copy wins
+    return list(by_id.values())
+
+def remove_archived(path: str, tasks: Iterable[Task]) -> None:
+    # rewrite the partitions holding these tasks without them
+    by_partition: Dict[str, set] = {}
+    for task in tasks:
+        by_partition.setdefault(_partition_path(path, task), set()).add(task.id)
+    with locked(path):
+        for part, ids in by_partition.items():
+            if not os.path.exists(part):
+                continue
+            kept = [r for r in _read_partition(part) if int(r.get("id", 0)) not in ids]
+            tmp = part + ".tmp"
+            with gzip.open(tmp, "wt", encoding="utf-8") as f:
+                f.writelines(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n"
+                             for r in kept)
+            os.replace(tmp, part)
+
+def _file_key(path: str):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+class StoreSync:
+    """What one process has seen of a JSON store shared with other processes.
+
+    ``mark`` remembers the end of the journal (call it right before loading
+    the store). ``poll`` then reads only the records appended since, by any
+    process, so other writers' changes are reconciled record by record
+    instead of by reloading the store. If another process compacts the
+    store the snapshot changes under us and ``needs_reload`` is set.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.needs_reload = False
+        self._lock = threading.Lock()
+        self._offset = 0
+        self._journal_key = None
+        self._snapshot_key = None
+        self._seen: Dict[int, Optional[dict]] = {}      # latest change by other writers
+        self._incoming: Dict[int, Optional[dict]] = {}  # not yet collected by drain()
+
+    def mark(self) -> None:
+        with locked(self.path):
+            with self._lock:
+                self._seen.clear()
+                self._incoming.clear()
+                self.needs_reload = False
+            self.mark_positions()
+
+    def mark_positions(self) -> None:
+        # everything currently on disk has been accounted for
+        self._snapshot_key = _file_key(self.path)
+        try:
+            st = os.stat(journal_path(self.path))
+        except FileNotFoundError:
+            self._journal_key, self._offset = None, 0
+        else:
+            self._journal_key, self._offset = (st.st_dev, st.st_ino), st.st_size
+
+    def poll(self) -> bool:
+        """Read records appended by other processes; True if anything changed."""
+        try:
+            size = os.path.getsize(journal_path(self.path))
+        except OSError:
+            size = 0
+        if size == self._offset and _file_key(self.path) == self._snapshot_key:
+            return False  # the common case needs neither the lock nor a read
+        with locked(self.path):
+            return self._poll()
+
+    def _poll(self) -> bool:
+        if _file_key(self.path) != self._snapshot_key:
+            self.needs_reload = True
+            return True
+        jpath = journal_path(self.path)
+        try:
+            st = os.stat(jpath)
+        except FileNotFoundError:
+            return False
+        if (st.st_dev, st.st_ino) != self._journal_key:
+            self._journal_key, self._offset = (st.st_dev, st.st_ino), 0
+        if st.st_size <= self._offset:
+            return False
+        with open(jpath, "rb") as f:
+            f.seek(self._offset)
+            data = f.read(st.st_size - self._offset)
+        end = data.rfind(b"\n") + 1  # a line still being written is read next time
+        if not end:
+            return False
+        self._offset += end
+        changes: Dict[int, Optional[dict]] = {}
+        _parse_journal(data[:end].splitlines(), changes)
+        with self._lock:
+            self._seen.update(changes)
+            self._incoming.update(changes)
+        return bool(changes)
+
+    def remote_change(self, task_id: int):
+        # (found, record) for the latest change another process made to task_id
+        with self._lock:
+            if task_id in self._seen:
+                return True, self._seen[task_id]
+            return False, None
+
+    def queue(self, task_id: int, record: Optional[dict]) -> None:
+        with self._lock:
+            self._incoming[task_id] = record
+
+    def drain(self) -> Dict[int, Optional[dict]]:
+        """Changes the owner has not applied yet: task_id -> task dict, None = deleted."""
+        with self._lock:
+            incoming, self._incoming = self._incoming, {}
+        return incoming
+
+class BackgroundWriter:
+    """Coalesces task changes and persists them off the UI thread.
+
+    ``put``/``delete`` only record an immutable snapshot of the change; a
+    daemon thread waits ``window`` seconds after the first change of a burst
+    and writes everything collected so far with one ``apply_changes`` call
+    (several changes to the same task collapse into one record). ``flush``
+    writes synchronously on the calling thread, e.g. when the app closes.
+    """
+
+    def __init__(self, path: str, backend=None, window: float = 0.5, sync=None):
+        self.path = path
+        self.backend = backend if backend is not None else get_backend(path)
+        self.window = window
+        self.sync = sync  # the backend's StoreSync when the store is shared
+        self.saves_requested = 0   # put/delete calls
+        self.saves_performed = 0   # backend writes actually issued
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()  # one backend write at a time
+        self._pending: Dict[int, Optional[dict]] = {}  # task_id -> task dict, None = delete
+        self._owners: Dict[int, Task] = {}  # tasks whose version is bumped once written
+        self._written: Dict[int, int] = {}  # last version written per id (guarded by _io_lock)
+        self._dirty_since: Optional[float] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="todo-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, task: Task) -> None:
+        with self._cond:
+            self._owners[task.id] = task
+        self._mark(task.id, task.to_dict())
+
+    def delete(self, task_id: int) -> None:
+        self._mark(int(task_id), None)
+
+    def _mark(self, task_id: int, record: Optional[dict]) -> None:
+        with self._cond:
+            self._pending[task_id] = record
+            self.saves_requested += 1
+            if self._dirty_since is None:
+                self._dirty_since = time.monotonic()
+                self._cond.notify()
+
+    def _take(self) -> Dict[int, Optional[dict]]:
+        batch, self._pending = self._pending, {}
+        self._dirty_since = None
+        return batch
+
+    def _write_pending(self) -> None:
+        # take and write under _io_lock, so batches reach disk in the order
+        # they were taken even when flush() races the writer thread
+        with self._io_lock:
+            with self._cond:
+                batch = self._take()
+            self._write(batch)
+
+    def _write(self, batch: Dict[int, Optional[dict]]) -> None:
+        if not batch:
+            return
+        puts = []
+        for tid, rec in batch.items():
+            if rec is None:
+                continue
+            last = self._written.get(tid, 0)
+            if last > int(rec.get("version") or 0):
+                # queued while an earlier batch was being written: it builds on that write
+                rec = dict(rec, version=last)
+            puts.append(rec)
+        deletes = [tid for tid, rec in batch.items() if rec is None]
+        try:
+            written = self.backend.apply_changes(self.path, puts, deletes, sync=self.sync)
+        except Exception:
+            logging.exception("Background save failed; will retry")
+            with self._cond:
+                # keep newer changes that arrived while we were writing
+                for tid, rec in batch.items():
+                    self._pending.setdefault(tid, rec)
+                if self._dirty_since is None:
+                    self._dirty_since = time.monotonic()
+            raise
+        self.saves_performed += 1
+        self._written.update(written)
+        for tid in deletes:
+            self._written.pop(tid, None)
+        with self._cond:
+            for tid, version in written.items():
+                task = self._owners.get(tid)
+                if task is not None and task.version < version:
+                    task.version = version  # later edits start from what is on disk
+                if tid not in self._pending:
+                    self._owners.pop(tid, None)
+        self.backend.maybe_compact(self.path, sync=self.sync)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._dirty_since is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # coalesce: let the burst settle for the rest of the window
+                delay = self._dirty_since + self.window - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+            try:
+                self._write_pending()
+            except Exception:
+                time.sleep(self.window)
+
+    def is_pending(self, task_id: int) -> bool:
+        with self._cond:
+            return task_id in self._pending
+
+    def flush(self) -> None:
+        self._write_pending()
+
+    def close(self) -> None:
+        # stop the thread, then write whatever is still pending
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
@@ -0,0 +1,46 @@
+import time
+from typing import Callable, Dict, List, Tuple
+
+class TimerScheduler:
+    """Running task timers stored as start timestamps plus accumulated seconds.
+
+    Nothing is incremented per tick; elapsed time is computed on demand, so a
+    single UI refresh loop can serve any number of running timers.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._running: Dict[int, Tuple[float, int]] = {}  # task_id -> (started, accumulated)
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._running
+
+    def __len__(self) -> int:
+        return len(self._running)
+
+    def running_ids(self) -> List[int]:
+        return list(self._running)
+
+    def start(self, task_id: int, accumulated: int = 0) -> None:
+        if task_id not in self._running:
+            self._running[task_id] = (self._clock(), int(accumulated or 0))
+
+    def elapsed(self, task_id: int, default: int = 0) -> int:
+        entry = self._running.get(task_id)
+        if entry is None:
+            return int(default or 0)
+        started, accumulated = entry
+        return accumulated + int(self._clock() - started)
+
+    def running_for(self, task_id: int) -> int:
+        # seconds since the current run started (the session being tracked)
+        entry = self._running.get(task_id)
+        if entry is None:
+            return 0
+        return int(self._clock() - entry[0])
+
+    def stop(self, task_id: int) -> int:
+        # returns the total elapsed seconds; 0 if the timer was not running
+        total = self.elapsed(task_id)
+        self._running.pop(task_id, None)
+        return total
@@ -0,0 +1,129 @@
+"""Time-tracking sessions and the totals reported from them.
+
+A task's ``sessions`` are closed ``(start, end)`` pairs of local ISO
+timestamps, appended when its timer stops; nothing is written while a timer
+runs. Totals are computed from sorted, merged intervals, so time during
+which several timers ran at once (every pending task's timer runs while
+the app is open) counts once per group rather than once per timer.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .models import Task
+
+Interval = Tuple[datetime, datetime]
+
+COALESCE_GAP_S = 1  # a restart within this many seconds extends the previous session
+
+def record_session(task: Task, seconds: int, end: Optional[datetime] = None) -> bool:
+    """Append the ``seconds`` just tracked (ending at ``end``) to task.sessions."""
+    seconds = int(seconds)
+    if seconds < 1:
+        return False
+    end = (end or datetime.now()).replace(microsecond=0)
+    start = end - timedelta(seconds=seconds)
+    sessions = list(task.sessions)
+    if sessions:
+        last_start, last_end = sessions[-1]
+        try:
+            adjacent = datetime.fromisoformat(last_end) >= start - timedelta(seconds=COALESCE_GAP_S)
+        except ValueError:
+            adjacent = False
+        if adjacent:
+            sessions[-1] = (last_start, max(last_end, end.isoformat()))
+            task.sessions = tuple(sessions)
+            return True
+    sessions.append((start.isoformat(), end.isoformat()))
+    task.sessions = tuple(sessions)
+    return True
+
+def intervals(task: Task) -> List[Interval]:
+    result = []
+    for start, end in task.sessions:
+        try:
+            interval = (datetime.fromisoformat(start), datetime.fromisoformat(end))
+        except (TypeError, ValueError):
+            continue  # a hand-edited store shouldn't break the report
+        if interval[1] > interval[0]:
+            result.append(interval)
+    return result
+
+def iter_intervals(tasks: Iterable[Task], running: Optional[Dict[int, int]] = None,
+                   now: Optional[datetime] = None) -> Iterator[Tuple[Task, Interval]]:
+    """Every session of every task; ``running`` maps task ids to seconds of an open session."""
+    now = now or datetime.now()
+    for task in tasks:
+        for interval in intervals(task):
+            yield task, interval
+        seconds = running.get(task.id, 0) if running else 0
+        if seconds > 0:
+            yield task, (now - timedelta(seconds=seconds), now)
+
+def merge_intervals(items: Iterable[Interval]) -> List[Interval]:
+    # sort by start, then sweep: overlapping or touching intervals fuse
+    merged: List[Interval] = []
+    for start, end in sorted(items):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+def clip(items: Iterable[Interval], start: Optional[datetime] = None,
+         end: Optional[datetime] = None) -> Iterator[Interval]:
+    for a, b in items:
+        if start is not None and a < start:
+            a = start
+        if end is not None and b > end:
+            b = end
+        if b > a:
+            yield a, b
+
+def seconds_by_day(merged: Iterable[Interval]) -> Dict[date, int]:
+    """Seconds per calendar day; intervals crossing midnight are split."""
+    totals: Dict[date, float] = {}
+    for start, end in merged:
+        while start < end:
+            midnight = datetime.combine(start.date() + timedelta(days=1), time())
+            part_end = min(end, midnight)
+            day = start.date()
+            totals[day] = totals.get(day, 0.0) + (part_end - start).total_seconds()
+            start = part_end
+    return {day: int(round(s)) for day, s in sorted(totals.items())}
+
+def week_of(day: date) -> date:
+    return day - timedelta(days=day.weekday())  # the Monday starting its ISO week
+
+def _total(merged: Iterable[Interval]) -> int:
+    return int(round(sum((b - a).total_seconds() for a, b in merged)))
+
+def summarize(tasks: Iterable[Task], start: Optional[datetime] = None,
+              end: Optional[datetime] = None, running: Optional[Dict[int, int]] = None,
+              now: Optional[datetime] = None) -> dict:
+    """Tracked-time totals between ``start`` and ``end`` (both optional).
+
+    ``total``, ``by_day`` and ``by_week`` count wall-clock time during which
+    any timer ran; ``by_priority`` and ``by_task`` merge within each group.
+    """
+    everything: List[Interval] = []
+    per_priority: Dict[str, List[Interval]] = {}
+    per_task: Dict[int, List[Interval]] = {}
+    for task, interval in iter_intervals(tasks, running, now):
+        for piece in clip((interval,), start, end):
+            everything.append(piece)
+            per_priority.setdefault(task.priority, []).append(piece)
+            per_task.setdefault(task.id, []).append(piece)
+    merged = merge_intervals(everything)
+    by_day = seconds_by_day(merged)
+    by_week: Dict[date, int] = {}
+    for day, seconds in by_day.items():
+        monday = week_of(day)
+        by_week[monday] = by_week.get(monday, 0) + seconds
+    by_task = {tid: _total(merge_intervals(items)) for tid, items in per_task.items()}
+    return {
+        "total": _total(merged),
+        "by_day": by_day,
+        "by_week": by_week,
+        "by_priority": {p: _total(merge_intervals(items)) for p, items in per_priority.items()},
+        "by_task": dict(sorted(by_task.items(), key=lambda kv: -kv[1])),
+    }
@@ -10,3 +10,37 @@ def format_duration(seconds: int) -> str:
         return f"{hrs:d}:{mins:02d}:{secs:02d}"
     else:
         return f"{mins:d}:{secs:02d}"
+
+def parse_due_date(value):
+    # due dates are stored as YYYY-MM-DD, but older data has YYYYMMDD;
+    # returns a datetime.date, or None for empty/unparseable values
+    from datetime import datetime
+    if not value:
+        return None
+    text = str(value).strip()
+    for fmt in ("%Y-%m-%d", "%Y%m%d"):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            pass
+    return None
+
+def normalize_due_date(value):
+    # canonical YYYY-MM-DD for storage; None when empty, ValueError when invalid
+    if value is None or not str(value).strip():
+        return None
+    due = parse_due_date(value)
+    if due is None:
+        raise ValueError(f"invalid due date {value!r}, expected YYYY-MM-DD")
+    return due.isoformat()
+
+def due_bucket(due, today) -> str:
+    # "overdue", "today", "week" (next 7 days), "later", or "none" without a date
+    if due is None:
+        return "none"
+    days = (due - today).days
+    if days < 0:
+        return "overdue"
+    if days == 0:
+        return "today"
+    return "week" if days <= 7 else "later"
@@ -0,0 +1,40 @@
+"""Pick up changes other processes make to the task store."""
+from typing import Dict, Iterable, Optional
+from .models import Task
+
+def diff_tasks(current, loaded: Iterable[Task]) -> Dict[int, Optional[Task]]:
+    """Changes turning ``current`` (a TaskRepository) into ``loaded``: id -> Task, None = removed."""
+    changes: Dict[int, Optional[Task]] = {}
+    seen = set()
+    for task in loaded:
+        seen.add(task.id)
+        old = current.get(task.id)
+        if old is None or old != task:
+            changes[task.id] = task
+    for task in current:
+        if task.id not in seen:
+            changes[task.id] = None
+    return changes
+
+class StoreWatcher:
+    """Polls a store for edits made by other processes (scripts, other windows).
+
+    A check costs two ``stat`` calls while nothing changed: the backend's
+    ``StoreSync.poll`` compares the snapshot's mtime/size and the journal
+    size with what it saw last. New journal records (or changed SQLite rows)
+    are returned as they are; only after another process compacted the
+    store is it reloaded and diffed against the in-memory tasks by id.
+    """
+
+    def __init__(self, path: str, backend, sync):
+        self.path = path
+        self.backend = backend
+        self.sync = sync
+
+    def changes(self, current) -> Dict[int, Optional[Task]]:
+        self.sync.poll()
+        if self.sync.needs_reload:
+            self.sync.mark()
+            return diff_tasks(current, self.backend.load_tasks(self.path))
+        return {task_id: None if record is None else Task.from_dict(record)
+                for task_id, record in self.sync.drain().items()}